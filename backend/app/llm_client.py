@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import json
 import time
-from typing import Any
+from typing import Any, Iterator
 
 from openai import OpenAI, APIConnectionError, APIStatusError, RateLimitError
 
@@ -19,13 +20,14 @@ class LlmClient:
         )
         self._settings = settings
 
-    def _make_request_with_retry(self, request_func, max_retries=3) -> dict[str, Any]:
+    def _make_request_with_retry(self, request_func, max_retries=3, dump=True) -> Any:
         """
         Make OpenAI request with exponential backoff for rate limits.
         
         Args:
             request_func: Function that makes the OpenAI API call
             max_retries: Maximum number of retries for rate limit errors
+            dump: Return the response as a dict (False returns it untouched, e.g. a stream)
             
         Returns:
             Response from OpenAI API
@@ -38,7 +40,7 @@ class LlmClient:
         for attempt in range(max_retries + 1):
             try:
                 resp = request_func()
-                return resp.model_dump()
+                return resp.model_dump() if dump else resp
             except RateLimitError as e:
                 last_error = e
                 if attempt < max_retries:
@@ -72,19 +74,87 @@ class LlmClient:
         # Should never reach here, but just in case
         raise RuntimeError(f"Request failed: {last_error}") from last_error
 
-    def vision_completion(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+    def vision_completion_stream(
+        self,
+        messages: list[dict[str, Any]],
+        response_format: dict[str, Any] | None = None,
+    ) -> Iterator[str]:
+        """Stream a vision completion, yielding content deltas as they arrive."""
         def request():
             return self._client.chat.completions.create(
                 model=self._settings.openai_vision_model,
                 messages=messages,
-                response_format={"type": "json_object"},
+                response_format=response_format or {"type": "json_object"},
+                stream=True,
             )
         
         try:
-            return self._make_request_with_retry(request)
+            stream = self._make_request_with_retry(request, dump=False)
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Release the connection even when the caller stops reading early
+                stream.close()
+        except (APIConnectionError, APIStatusError) as e:
+            raise RuntimeError(f"Vision model error: API error: {e}") from e
         except RuntimeError as e:
             raise RuntimeError(f"Vision model error: {e}") from e
 
+    def submit_vision_batch(
+        self,
+        requests: list[tuple[str, list[dict[str, Any]]]],
+        response_format: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Upload vision chat requests as a JSONL file and start a batch job.
+        
+        Args:
+            requests: List of (custom_id, messages) pairs, one per photo
+            response_format: Response format applied to every request
+            
+        Returns:
+            Batch ID
+        """
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self._settings.openai_vision_model,
+                    "messages": messages,
+                    "response_format": response_format or {"type": "json_object"},
+                },
+            })
+            for custom_id, messages in requests
+        ]
+        try:
+            batch_file = self._client.files.create(
+                file=("vision_batch.jsonl", "\n".join(lines).encode()),
+                purpose="batch",
+            )
+            batch = self._client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+        except (APIConnectionError, APIStatusError) as e:
+            raise RuntimeError(f"Vision batch error: {e}") from e
+        return batch.id
+
+    def fetch_batch_output(self, batch_id: str) -> tuple[str, list[dict[str, Any]]]:
+        """Return (status, output rows); rows are only populated once the batch has completed."""
+        try:
+            batch = self._client.batches.retrieve(batch_id)
+            if batch.status != "completed" or not batch.output_file_id:
+                return batch.status, []
+            output = self._client.files.content(batch.output_file_id)
+        except (APIConnectionError, APIStatusError) as e:
+            raise RuntimeError(f"Vision batch error: {e}") from e
+        return batch.status, [json.loads(line) for line in output.text.splitlines() if line.strip()]
+
     def text_completion(self, messages: list[dict[str, Any]], json_mode: bool = True) -> dict[str, Any]:
         def request():
             return self._client.chat.completions.create(
@@ -1,4 +1,5 @@
 import asyncio
+import hashlib
 import json
 import os
 import sys
@@ -11,8 +12,9 @@ shared_path = current_file.parent.parent.parent.parent / "shared"
 if str(shared_path) not in sys.path:
     sys.path.insert(0, str(shared_path))
 
-from fastapi import FastAPI, File, Form, Header, HTTPException, UploadFile, BackgroundTasks, Body
+from fastapi import FastAPI, File, Form, Header, HTTPException, UploadFile, BackgroundTasks, Body, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse, Response
 from postgrest.exceptions import APIError
 from pydantic import BaseModel
@@ -37,7 +39,7 @@ from app.validation import (
 from app.metadata_schema import validate_metadata
 from app.pipeline import run_pipeline_agentic_async, generate_embeddings_async
 from app.vision import extract_from_photo
-from ledger.ledger.writer import fetch_ledger_events
+from ledger.ledger.writer import fetch_ledger_events, iter_ledger_events
 
 
 class CreateAppraisalRequest(BaseModel):
@@ -75,6 +77,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (appraisal payloads, photos, ledger); small bodies are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 
 def resolve_appraisal_id(appraisal_ref: str) -> tuple[str | None, str | None]:
     """Resolve an appraisal reference (either short_id or UUID) to both UUID and short_id."""
@@ -103,6 +108,15 @@ def resolve_appraisal_id(appraisal_ref: str) -> tuple[str | None, str | None]:
         return None, None
 
 
+def _with_etag(response: JSONResponse, if_none_match: str | None) -> Response:
+    """Attach an ETag over the response body, or return an empty 304 when it matches If-None-Match."""
+    etag = f'"{hashlib.sha256(response.body).hexdigest()[:32]}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return response
+
+
 def run_vision_extraction_sync(appraisal_id: str, artifact_id: str):
     """Run vision extraction synchronously (for BackgroundTasks)."""
     try:
@@ -561,8 +575,16 @@ async def get_run_status(appraisal_id: str, run_id: str) -> JSONResponse:
 
 
 @app.get("/api/appraisals/{appraisal_id}")
-async def get_appraisal_latest(appraisal_id: str) -> JSONResponse:
-    """Get appraisal with latest run results."""
+async def get_appraisal_latest(
+    appraisal_id: str,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
+    """
+    Get appraisal with latest run results.
+    
+    Responses carry an ETag over the body; a matching If-None-Match gets an empty
+    304 so status pollers skip the payload when nothing has changed.
+    """
     uuid, short_id = resolve_appraisal_id(appraisal_id)
     if not uuid:
         raise HTTPException(status_code=404, detail=f"Appraisal '{appraisal_id}' not found")
@@ -592,12 +614,56 @@ async def get_appraisal_latest(appraisal_id: str) -> JSONResponse:
         )
         latest_run = run_res.data[0] if run_res.data else None
 
-    return JSONResponse(
+    response = JSONResponse(
         content={
             "appraisal": appraisal.data[0],
             "latest_run": latest_run,
         }
     )
+    return _with_etag(response, if_none_match)
+
+
+@app.get("/api/appraisals/{appraisal_id}/status")
+async def get_appraisal_status(
+    appraisal_id: str,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
+    """
+    Get only the latest run's id and status.
+    
+    A few dozen bytes instead of the full appraisal payload, for clients polling
+    until a run finishes; supports If-None-Match like the appraisal endpoint.
+    """
+    uuid, short_id = resolve_appraisal_id(appraisal_id)
+    if not uuid:
+        raise HTTPException(status_code=404, detail=f"Appraisal '{appraisal_id}' not found")
+    
+    supabase = get_supabase_client()
+
+    appraisal = (
+        supabase.table("appraisals")
+        .select("latest_run_id")
+        .eq("id", uuid)
+        .limit(1)
+        .execute()
+    )
+    if not appraisal.data:
+        raise HTTPException(status_code=404, detail="Appraisal not found")
+
+    latest_run_id = appraisal.data[0]["latest_run_id"]
+    status = None
+    if latest_run_id:
+        run_res = (
+            supabase.table("pipeline_runs")
+            .select("status")
+            .eq("id", latest_run_id)
+            .limit(1)
+            .execute()
+        )
+        status = run_res.data[0]["status"] if run_res.data else None
+
+    response = JSONResponse(content={"run_id": latest_run_id, "status": status})
+    return _with_etag(response, if_none_match)
 
 
 @app.get("/api/appraisals/{appraisal_id}/runs")
@@ -632,7 +698,8 @@ async def get_appraisal_photos(appraisal_id: str) -> JSONResponse:
     artifacts_data = supabase.table("artifacts").select("*").eq("appraisal_id", appraisal_id).execute()
     artifacts = artifacts_data.data or []
     
-    # Create signed URLs for artifacts
+    # Create signed URLs for artifacts (plus a resized preview when thumbnails are enabled)
+    thumbnail_width = get_settings().photo_thumbnail_width
     for artifact in artifacts:
         storage_path = artifact.get("storage_path")
         if storage_path:
@@ -640,20 +707,36 @@ async def get_appraisal_photos(appraisal_id: str) -> JSONResponse:
                 artifact["signed_url"] = create_signed_url(supabase, storage_path)
             except Exception:
                 artifact["signed_url"] = None
+            if thumbnail_width > 0:
+                try:
+                    artifact["thumbnail_url"] = create_signed_url(
+                        supabase,
+                        storage_path,
+                        transform={"width": thumbnail_width, "resize": "contain", "quality": 75},
+                    )
+                except Exception:
+                    artifact["thumbnail_url"] = None
     
     return JSONResponse(content={"photos": artifacts})
 
 
 @app.get("/api/appraisals/{appraisal_id}/ledger")
-async def get_appraisal_ledger(appraisal_id: str) -> JSONResponse:
-    """Get ledger events for an appraisal."""
+async def get_appraisal_ledger(
+    appraisal_id: str,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+) -> JSONResponse:
+    """Get ledger events for an appraisal (optionally one page via limit/offset)."""
     uuid, short_id = resolve_appraisal_id(appraisal_id)
     if not uuid:
         return JSONResponse(status_code=404, content={"error": f"Appraisal '{appraisal_id}' not found"})
     appraisal_id = uuid
     
     supabase = get_supabase_client()
-    events = fetch_ledger_events(supabase, appraisal_id=appraisal_id)
+    if limit is None:
+        events = [event for page in iter_ledger_events(supabase, appraisal_id=appraisal_id) for event in page]
+    else:
+        events = fetch_ledger_events(supabase, appraisal_id=appraisal_id, limit=limit, offset=offset)
     return JSONResponse(content={"events": events})
 
 
@@ -665,7 +748,7 @@ async def download_appraisal_ledger(appraisal_id: str) -> Response:
         return JSONResponse(status_code=404, content={"error": f"Appraisal '{appraisal_id}' not found"})
     
     supabase = get_supabase_client()
-    events = fetch_ledger_events(supabase, appraisal_id=uuid)
+    events = [event for page in iter_ledger_events(supabase, appraisal_id=uuid) for event in page]
     
     return Response(
         content=json.dumps({"events": events}, indent=2),
@@ -20,14 +20,18 @@ if str(shared_path) not in sys.path:
 from supabase import Client
 
 from app.supabase_client import get_supabase_client
+from ledger.ledger.writer import flush_ledger
 
 try:
     from agent.agent.agent import create_appraisal_agent
-    from agent.agent.executor import execute_agent_with_ledger
+    from agent.agent.executor import execute_agent_with_ledger_async
     AGENT_AVAILABLE = True
 except ImportError:
     AGENT_AVAILABLE = False
 
+# Upper bound on waiting for a run's ledger rows before updating its status
+LEDGER_FLUSH_TIMEOUT_SECONDS = 10.0
+
 
 async def run_pipeline_agentic_async(pipeline_run_id: str, appraisal_id: str) -> str:
     """
@@ -115,19 +119,20 @@ async def run_pipeline_agentic_async(pipeline_run_id: str, appraisal_id: str) ->
         }
         
         # Execute agent with ledger tracking
-        def execute_agent():
-            return execute_agent_with_ledger(
-                agent=agent,
-                supabase=supabase,
-                appraisal_id=appraisal_id,
-                pipeline_run_id=pipeline_run_id,
-                initial_context=initial_context,
-            )
-        
-        result = await asyncio.to_thread(execute_agent)
+        result = await execute_agent_with_ledger_async(
+            agent=agent,
+            supabase=supabase,
+            appraisal_id=appraisal_id,
+            pipeline_run_id=pipeline_run_id,
+            initial_context=initial_context,
+        )
         
         final_status = "COMPLETED"
         
+        # Ledger rows are written by a background thread; let them land before the
+        # run is marked finished so the ledger viewer never shows a partial ledger
+        await asyncio.to_thread(flush_ledger, LEDGER_FLUSH_TIMEOUT_SECONDS)
+        
         # Update with final status and outputs
         def update_completed():
             supabase.table("pipeline_runs").update({
@@ -139,6 +144,8 @@ async def run_pipeline_agentic_async(pipeline_run_id: str, appraisal_id: str) ->
         await asyncio.to_thread(update_completed)
         
     except Exception as e:
+        await asyncio.to_thread(flush_ledger, LEDGER_FLUSH_TIMEOUT_SECONDS)
+        
         # Mark as failed
         def update_failed():
             supabase.table("pipeline_runs").update({
@@ -13,6 +13,7 @@ from typing import Any
 
 
 REQUIRED_ANGLES = ["front", "rear", "left", "right", "interior", "odometer"]
+REQUIRED_ANGLE_SET = frozenset(REQUIRED_ANGLES)
 
 # Points per angle type
 ANGLE_POINTS = {
@@ -54,7 +55,7 @@ def score_angle_coverage(vision_outputs: list[dict[str, Any]], metadata: dict[st
         # Only count angles with reasonable confidence (>= 0.7) and not "unknown"
         if angle != "unknown" and confidence >= 0.7:
             angle_lower = angle.lower()
-            if angle_lower in REQUIRED_ANGLES:
+            if angle_lower in REQUIRED_ANGLE_SET:
                 covered_angles_set.add(angle_lower)
                 # Track highest confidence for each angle
                 if angle_lower not in angle_confidence_map or confidence > angle_confidence_map[angle_lower]:
@@ -261,12 +262,16 @@ def score_notes_consistency(notes: str, vision_outputs: list[dict[str, Any]], me
 
 
 def calculate_total_score(context: dict[str, Any]) -> dict[str, Any]:
-    """Calculate total decision readiness score from all components."""
+    """
+    Calculate total decision readiness score from all components.
+    context may carry an "angle_coverage" result already computed by
+    score_angle_coverage for the same vision outputs, which is then reused.
+    """
     vision_outputs = context.get("vision_outputs", [])
     notes = context.get("notes", "")
     metadata = context.get("normalized_metadata", {})
     
-    angle_score = score_angle_coverage(vision_outputs, metadata)
+    angle_score = context.get("angle_coverage") or score_angle_coverage(vision_outputs, metadata)
     odometer_score = score_odometer_confidence(vision_outputs)
     vin_score = score_vin_presence(vision_outputs)
     damage_score = score_damage_confidence(vision_outputs)
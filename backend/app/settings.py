@@ -26,10 +26,15 @@ class Settings(BaseSettings):
 
     # Features
     enable_rag: bool = Field(default=True, alias="ENABLE_RAG")
+    # Shared Redis cache for query embeddings (L2 behind the in-process LRU)
+    enable_embedding_cache: bool = Field(default=False, alias="ENABLE_EMBEDDING_CACHE")
+    redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
 
     # Render-specific
     port: int = Field(default=10000, alias="PORT")
     signed_url_expiration: int = Field(default=3600, alias="SIGNED_URL_EXPIRATION")
+    # Width of resized photo previews; 0 disables (needs Supabase image transformations)
+    photo_thumbnail_width: int = Field(default=0, alias="PHOTO_THUMBNAIL_WIDTH")
     cors_origins: str = Field(default="*", alias="CORS_ORIGINS")
 
     # Agent configuration
@@ -57,7 +57,12 @@ def upload_artifact_bytes(
     return storage_path
 
 
-def create_signed_url(supabase: Client, storage_path: str, expires_in_seconds: int | None = None) -> str:
+def create_signed_url(
+    supabase: Client,
+    storage_path: str,
+    expires_in_seconds: int | None = None,
+    transform: dict | None = None,
+) -> str:
     """
     Create a short-lived signed URL for private artifact access.
     
@@ -66,6 +71,8 @@ def create_signed_url(supabase: Client, storage_path: str, expires_in_seconds: i
         storage_path: Path to the file in storage
         expires_in_seconds: URL expiration time. Defaults to SIGNED_URL_EXPIRATION env var
                            or 3600 (1 hour) for production, 600 (10 min) for development.
+        transform: Optional Supabase image transformation (width, height, resize, quality)
+                   to sign a resized rendition instead of the original
     
     Returns:
         Signed URL string
@@ -87,6 +94,7 @@ def create_signed_url(supabase: Client, storage_path: str, expires_in_seconds: i
     res = supabase.storage.from_(settings.supabase_storage_bucket).create_signed_url(
         storage_path,
         expires_in_seconds,
+        {"transform": transform} if transform else {},
     )
     # supabase-py returns dict with 'signedURL'
     if isinstance(res, dict):
@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-import json
-import re
-from typing import Any
+from contextlib import closing
+from typing import Any, Iterable
 
-from pydantic import ValidationError
+from pydantic_core import from_json
 
 from app.llm_client import get_llm_client
-from app.validation import validate_vin_checksum
-from app.vision_schemas import VisionExtractionEnvelope
+from app.validation import VIN_VALUES, VIN_WEIGHTS
+from app.vision_schemas import PHOTO_ANGLES, VisionExtractionEnvelope
 
 
 PROMPT_VISION = """You are a vision assistant for auto appraisals.
@@ -67,54 +66,143 @@ Please fix the JSON to match this EXACT structure:
 Return only valid JSON matching this structure."""
 
 
+# Keywords OpenAI strict structured outputs reject; pydantic still enforces them locally.
+_STRICT_UNSUPPORTED_KEYWORDS = frozenset({"default", "minimum", "maximum"})
+
+
+def _to_strict_json_schema(schema: Any) -> Any:
+    """Adapt a pydantic JSON schema to OpenAI strict mode (all fields required, no extras)."""
+    if isinstance(schema, list):
+        return [_to_strict_json_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    strict: dict[str, Any] = {}
+    for key, value in schema.items():
+        if key in _STRICT_UNSUPPORTED_KEYWORDS:
+            continue
+        if key in ("properties", "$defs"):
+            strict[key] = {name: _to_strict_json_schema(sub) for name, sub in value.items()}
+        else:
+            strict[key] = _to_strict_json_schema(value)
+
+    if strict.get("type") == "object" and "properties" in strict:
+        strict["required"] = list(strict["properties"])
+        strict["additionalProperties"] = False
+    return strict
+
+
+# Computed once at import: constrains the vision model's decoder to the envelope
+# schema so compliant providers never need the repair round-trip below.
+ENVELOPE_SCHEMA = _to_strict_json_schema(VisionExtractionEnvelope.model_json_schema())
+VISION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "vision_extraction", "schema": ENVELOPE_SCHEMA, "strict": True},
+}
+
+
+def _strip_json_fence(content: str) -> str:
+    """Strip a ```json ... ``` markdown fence so the payload parses without a repair round-trip."""
+    if content.lstrip().startswith("```"):
+        start = content.find("{")
+        end = content.rfind("}")
+        if start != -1 and end > start:
+            return content[start:end + 1]
+    return content
+
+
+# Re-check the streamed prefix after roughly this many new bytes
+_PARTIAL_PARSE_EVERY = 256
+
+
+def _read_vision_stream(chunks: Iterable[str], buf: bytearray) -> None:
+    """
+    Accumulate streamed content into buf, parsing the JSON prefix as it arrives.
+    Raises ValueError as soon as the prefix is malformed instead of waiting for the
+    full response. Fenced (non-JSON-mode) output is only checked once complete.
+    """
+    checked = 0
+    for delta in chunks:
+        buf += delta.encode()
+        if len(buf) - checked >= _PARTIAL_PARSE_EVERY and buf.lstrip().startswith(b"{"):
+            checked = len(buf)
+            from_json(bytes(buf), allow_partial="trailing-strings")
+
+
 def check_odometer_plausibility(value: float | None, confidence: float) -> tuple[float, str | None]:
     """Apply plausibility checks to odometer reading. Returns (adjusted_confidence, warning_message)."""
     if value is None:
         return confidence, None
     
-    # Typical vehicle odometer range: 0 to 500,000 miles/km
-    if value < 0 or value > 500_000:
+    # Typical vehicle odometer range: 0 to 500,000 miles/km (also rejects NaN)
+    if not 0 <= value <= 500_000:
         return 0.0, f"Odometer value {value} is outside plausible range (0-500,000)"
-    
-    # Flag suspiciously round numbers if confidence is high (possible misread)
-    if value > 0 and value % 10000 == 0 and confidence > 0.8:
+
+    # Flag suspiciously round numbers if confidence is high (possible misread).
+    # Readings are whole numbers in practice, so test with integer modulo.
+    iv = int(value)
+    if iv == value and iv > 0 and iv % 10000 == 0 and confidence > 0.8:
         return confidence * 0.7, f"Odometer value {value} is suspiciously round"
     
     return confidence, None
 
 
+# _vin_status result codes
+_VIN_OK = 0
+_VIN_BAD_LENGTH = 1
+_VIN_HAS_IOQ = 2
+_VIN_BAD_CHARSET = 3
+_VIN_BAD_CHECKSUM = 4
+
+
+def _vin_status(text: str) -> tuple[int, str | None]:
+    """
+    Check VIN length, charset and checksum in a single pass over the string.
+    Returns (status_code, warning_message); I/O/Q takes precedence over other bad characters.
+    """
+    vin = text.upper()
+    if len(text) != 17:
+        return _VIN_BAD_LENGTH, f"VIN length {len(text)} is invalid (must be 17 characters)"
+
+    total = 0
+    charset_ok = len(vin) == 17  # upper() can expand some non-ASCII characters
+    for i, char in enumerate(vin):
+        value = VIN_VALUES.get(char)
+        if value is None:
+            # VIN should not contain I, O, or Q (to avoid confusion with 1, 0)
+            if char in "IOQ":
+                return _VIN_HAS_IOQ, "VIN contains invalid characters (I, O, or Q)"
+            charset_ok = False
+        elif charset_ok:
+            total += value * VIN_WEIGHTS[i]
+
+    if not charset_ok:
+        return _VIN_BAD_CHARSET, "VIN contains invalid characters (must be A-Z, 0-9, excluding I, O, Q)"
+
+    # Check digit is the 9th character (its own weight is 0)
+    check_digit = total % 11
+    if vin[8] != ("X" if check_digit == 10 else str(check_digit)):
+        return _VIN_BAD_CHECKSUM, "VIN checksum validation failed (invalid VIN)"
+
+    return _VIN_OK, None
+
+
 def check_vin_plausibility(text: str | None, confidence: float) -> tuple[float, str | None]:
     """Apply plausibility checks to VIN including checksum validation. Returns (adjusted_confidence, warning_message)."""
     if text is None:
         return confidence, None
     
-    # VIN should be exactly 17 characters
-    if len(text) != 17:
-        return 0.0, f"VIN length {len(text)} is invalid (must be 17 characters)"
-    
-    # VIN should not contain I, O, or Q (to avoid confusion with 1, 0)
-    if re.search(r'[IOQ]', text, re.IGNORECASE):
-        return confidence * 0.5, "VIN contains invalid characters (I, O, or Q)"
-    
-    # VIN should be alphanumeric
-    if not re.match(r'^[A-HJ-NPR-Z0-9]{17}$', text, re.IGNORECASE):
-        return 0.0, "VIN contains invalid characters (must be A-Z, 0-9, excluding I, O, Q)"
-    
-    # Validate VIN checksum
-    if not validate_vin_checksum(text):
-        return 0.0, "VIN checksum validation failed (invalid VIN)"
-    
-    return confidence, None
+    status, warning = _vin_status(text)
+    if status == _VIN_OK:
+        return confidence, None
+    if status == _VIN_HAS_IOQ:
+        return confidence * 0.5, warning
+    return 0.0, warning
 
 
-def extract_from_photo(photo_url: str, photo_id: str) -> dict[str, Any]:
-    """
-    Call vision model on a single photo URL and validate against schema.
-    Includes single retry with repair on validation failure.
-    Applies plausibility checks to odometer and VIN.
-    """
-    client = get_llm_client()
-    messages = [
+def _build_vision_messages(photo_url: str) -> list[dict[str, Any]]:
+    """Build the chat messages for a single-photo vision request."""
+    return [
         {
             "role": "system",
             "content": PROMPT_VISION,
@@ -128,55 +216,88 @@ def extract_from_photo(photo_url: str, photo_id: str) -> dict[str, Any]:
         },
     ]
 
-    envelope = None
+
+def _finalize_envelope(envelope: VisionExtractionEnvelope, photo_id: str) -> dict[str, Any]:
+    """Apply plausibility checks to a validated envelope and dump it to a result dict."""
+    # Ensure the photo_id is set as expected
+    if envelope.photo_id != photo_id:
+        envelope.photo_id = photo_id
+    
+    # Apply plausibility checks
+    warnings = []
+    
+    # Check odometer
+    odo = envelope.extraction.odometer
+    new_conf, warning = check_odometer_plausibility(odo.value, odo.confidence)
+    if warning:
+        warnings.append(warning)
+    odo.confidence = new_conf
+    
+    # Check VIN
+    vin = envelope.extraction.vin
+    new_conf, warning = check_vin_plausibility(vin.text, vin.confidence)
+    if warning:
+        warnings.append(warning)
+    vin.confidence = new_conf
+    
+    result = envelope.model_dump()
+    photo_angle = result["extraction"]["photo_angle"]
+    photo_angle["angle"] = PHOTO_ANGLES[photo_angle["angle"]]
+    if warnings:
+        result["plausibility_warnings"] = warnings
+    
+    return result
+
+
+def _degraded_result(photo_id: str, validation_error: str | None) -> dict[str, Any]:
+    """Minimal valid structure with zero confidence, used when extraction fails."""
+    return {
+        "photo_id": photo_id,
+        "extraction": {
+            "photo_angle": {"angle": "unknown", "confidence": 0.0},
+            "odometer": {"value": None, "unit": None, "confidence": 0.0},
+            "vin": {"text": None, "confidence": 0.0},
+            "damage": [],
+        },
+        "validation_error": validation_error,
+    }
+
+
+def extract_from_photo(photo_url: str, photo_id: str) -> dict[str, Any]:
+    """
+    Call vision model on a single photo URL and validate against schema.
+    Requests schema-constrained output; keeps a single repair retry as a
+    fallback for providers that ignore the schema.
+    Applies plausibility checks to odometer and VIN.
+    """
+    client = get_llm_client()
+    messages = _build_vision_messages(photo_url)
+
     validation_errors = None
     content = None
     
     for attempt in range(2):  # Initial + 1 retry
+        buf = bytearray()
+        content = None
         try:
-            raw = client.vision_completion(messages)
-            choice = raw["choices"][0]
-            content = choice["message"]["content"]
-            if isinstance(content, str):
-                data = json.loads(content)
-            else:
-                data = content
-
-            envelope = VisionExtractionEnvelope.model_validate(data)
-            # Ensure the photo_id is set as expected
-            if envelope.photo_id != photo_id:
-                envelope.photo_id = photo_id
-            
-            # Apply plausibility checks
-            warnings = []
-            
-            # Check odometer
-            odo = envelope.extraction.odometer
-            new_conf, warning = check_odometer_plausibility(odo.value, odo.confidence)
-            if warning:
-                warnings.append(warning)
-            odo.confidence = new_conf
-            
-            # Check VIN
-            vin = envelope.extraction.vin
-            new_conf, warning = check_vin_plausibility(vin.text, vin.confidence)
-            if warning:
-                warnings.append(warning)
-            vin.confidence = new_conf
-            
-            result = envelope.model_dump()
-            if warnings:
-                result["plausibility_warnings"] = warnings
+            # Close the stream if the prefix check bails out before it is exhausted
+            with closing(client.vision_completion_stream(messages, response_format=VISION_RESPONSE_FORMAT)) as chunks:
+                _read_vision_stream(chunks, buf)
+            content = buf.decode()
+            # Parse and validate in one step in pydantic-core (jiter)
+            envelope = VisionExtractionEnvelope.model_validate_json(_strip_json_fence(content))
+            return _finalize_envelope(envelope, photo_id)
             
-            return result
-            
-        except (ValidationError, json.JSONDecodeError) as e:
+        except ValueError as e:
+            # ValidationError (incl. invalid JSON) and jiter's partial-parse errors
             validation_errors = str(e)
+            if content is None:
+                content = buf.decode(errors="replace")
             if attempt == 0 and content:
                 # Retry with repair prompt
                 messages.append({
                     "role": "assistant",
-                    "content": content if isinstance(content, str) else json.dumps(content),
+                    "content": content,
                 })
                 messages.append({
                     "role": "user",
@@ -187,13 +308,60 @@ def extract_from_photo(photo_url: str, photo_id: str) -> dict[str, Any]:
                 break
     
     # If both attempts failed, return minimal valid structure with low confidence
-    return {
-        "photo_id": photo_id,
-        "extraction": {
-            "photo_angle": {"angle": "unknown", "confidence": 0.0},
-            "odometer": {"value": None, "unit": None, "confidence": 0.0},
-            "vin": {"text": None, "confidence": 0.0},
-            "damage": [],
-        },
-        "validation_error": validation_errors,
-    }
+    return _degraded_result(photo_id, validation_errors)
+
+
+def submit_batch(photos: list[tuple[str, str]]) -> str:
+    """
+    Submit vision extraction for many photos through the provider's Batches API.
+    Intended for offline/bulk ingests: ~50% cheaper, but results arrive asynchronously.
+    Interactive single-photo requests should keep using extract_from_photo.
+    
+    Args:
+        photos: List of (photo_url, photo_id) pairs
+        
+    Returns:
+        Batch ID to pass to poll_batch
+    """
+    requests = [
+        (photo_id, _build_vision_messages(photo_url))
+        for photo_url, photo_id in photos
+    ]
+    return get_llm_client().submit_vision_batch(requests, response_format=VISION_RESPONSE_FORMAT)
+
+
+def poll_batch(batch_id: str) -> list[dict[str, Any]] | None:
+    """
+    Collect results of a vision batch, running the same validation and plausibility
+    checks as extract_from_photo (without the repair retry).
+    
+    Returns:
+        One result per photo once the batch has completed, or None while it is still running
+        
+    Raises:
+        RuntimeError: If the batch failed, expired or was cancelled
+    """
+    status, rows = get_llm_client().fetch_batch_output(batch_id)
+    if status in ("failed", "expired", "cancelled"):
+        raise RuntimeError(f"Vision batch {batch_id} ended with status={status}")
+    if status != "completed":
+        return None
+    
+    results = []
+    for row in rows:
+        photo_id = row.get("custom_id")
+        body = (row.get("response") or {}).get("body") or {}
+        try:
+            message = body["choices"][0]["message"]
+            content = message["content"]
+            if not isinstance(content, str):
+                # Refusals (and other non-text replies) have no content to validate
+                reason = row.get("error") or message.get("refusal") or "Batch response has no text content"
+                results.append(_degraded_result(photo_id, str(reason)))
+                continue
+            envelope = VisionExtractionEnvelope.model_validate_json(_strip_json_fence(content))
+            results.append(_finalize_envelope(envelope, photo_id))
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            results.append(_degraded_result(photo_id, str(row.get("error") or e)))
+    
+    return results
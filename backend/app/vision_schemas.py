@@ -1,29 +1,39 @@
 from __future__ import annotations
 
-from enum import Enum
-from pydantic import BaseModel, Field
+import sys
+from typing import Literal, get_args
 
+from pydantic import BaseModel, ConfigDict, Field
 
-class PhotoAngle(str, Enum):
-    """Valid photo angles for vehicle appraisals."""
-    FRONT = "front"
-    REAR = "rear"
-    LEFT = "left"
-    RIGHT = "right"
-    INTERIOR = "interior"
-    ODOMETER = "odometer"
-    VIN = "vin"
-    DAMAGE = "damage"
-    UNKNOWN = "unknown"
+
+# Valid photo angles for vehicle appraisals (Literal validates faster than an Enum)
+PhotoAngle = Literal[
+    "front",
+    "rear",
+    "left",
+    "right",
+    "interior",
+    "odometer",
+    "vin",
+    "damage",
+    "unknown",
+]
+
+# Interned angle strings, keyed by value: downstream comparisons and dict lookups
+# on angles hit the pointer-equality fast path
+PHOTO_ANGLES: dict[str, str] = {angle: sys.intern(angle) for angle in get_args(PhotoAngle)}
 
 
 class VisionPhotoAngle(BaseModel):
     """Photo angle classification."""
-    angle: PhotoAngle = PhotoAngle.UNKNOWN
+    model_config = ConfigDict(frozen=True)
+
+    angle: PhotoAngle = "unknown"
     confidence: float = Field(ge=0.0, le=1.0, default=0.0)
 
 
 class VisionOdometer(BaseModel):
+    # Left mutable: plausibility checks adjust confidence in place.
     value: float | None = None
     unit: str | None = None
     confidence: float = Field(ge=0.0, le=1.0, default=0.0)
@@ -35,12 +45,16 @@ class VisionVin(BaseModel):
 
 
 class VisionDamage(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     description: str | None = None
     severity: str | None = None
     confidence: float = Field(ge=0.0, le=1.0, default=0.0)
 
 
 class VisionExtraction(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     photo_angle: VisionPhotoAngle
     odometer: VisionOdometer
     vin: VisionVin
@@ -0,0 +1,93 @@
+"""Tests for vision batch submission and result collection against a stubbed LLM client."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app import vision
+
+
+class StubBatchClient:
+    def __init__(self, status: str = "completed", rows: list[dict] | None = None):
+        self.status = status
+        self.rows = rows or []
+        self.submitted: list[tuple[str, list[dict]]] = []
+
+    def submit_vision_batch(self, requests, response_format=None):
+        self.submitted = requests
+        return "batch_123"
+
+    def fetch_batch_output(self, batch_id):
+        return self.status, self.rows
+
+
+def _row(photo_id: str, content, **message) -> dict:
+    return {
+        "custom_id": photo_id,
+        "response": {"body": {"choices": [{"message": {"content": content, **message}}]}},
+    }
+
+
+def _envelope(photo_id: str, angle: str = "front") -> str:
+    return json.dumps({
+        "photo_id": photo_id,
+        "extraction": {
+            "photo_angle": {"angle": angle, "confidence": 0.9},
+            "odometer": {"value": None, "unit": None, "confidence": 0.0},
+            "vin": {"text": None, "confidence": 0.0},
+            "damage": [],
+        },
+    })
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    def install(**kwargs) -> StubBatchClient:
+        client = StubBatchClient(**kwargs)
+        monkeypatch.setattr(vision, "get_llm_client", lambda: client)
+        return client
+    return install
+
+
+def test_submit_batch_sends_one_request_per_photo(stub_client):
+    client = stub_client()
+
+    batch_id = vision.submit_batch([("https://img/1.jpg", "p1"), ("https://img/2.jpg", "p2")])
+
+    assert batch_id == "batch_123"
+    assert [photo_id for photo_id, _ in client.submitted] == ["p1", "p2"]
+
+
+def test_poll_batch_returns_none_while_running(stub_client):
+    stub_client(status="in_progress")
+
+    assert vision.poll_batch("batch_123") is None
+
+
+@pytest.mark.parametrize("status", ["failed", "expired", "cancelled"])
+def test_poll_batch_raises_for_terminal_failures(stub_client, status):
+    stub_client(status=status)
+
+    with pytest.raises(RuntimeError):
+        vision.poll_batch("batch_123")
+
+
+def test_poll_batch_degrades_bad_rows_without_losing_others(stub_client):
+    stub_client(rows=[
+        _row("p1", _envelope("p1", "rear")),
+        _row("p2", None, refusal="I can't help with that."),
+        _row("p3", "not json"),
+        {"custom_id": "p4", "response": None, "error": {"message": "server error"}},
+        _row("p5", "```json\n" + _envelope("wrong-id") + "\n```"),
+    ])
+
+    results = vision.poll_batch("batch_123")
+
+    assert [r["photo_id"] for r in results] == ["p1", "p2", "p3", "p4", "p5"]
+    assert results[0]["extraction"]["photo_angle"]["angle"] == "rear"
+    assert "validation_error" not in results[0]
+    assert results[1]["validation_error"] == "I can't help with that."
+    assert results[2]["validation_error"]
+    assert "server error" in results[3]["validation_error"]
+    assert results[4]["extraction"]["photo_angle"]["angle"] == "front"
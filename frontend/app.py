@@ -2,18 +2,36 @@
 Vehicle Appraisal Pre-Check - Streamlit UI
 Streamlit UI for submitting appraisals and viewing results.
 """
-import os
+import html
 import json
-import uuid
+import os
+import socket
 import time
 import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - optional; stdlib decoder is slower but equivalent
+    _json_loads = json.loads
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:  # pragma: no cover - optional; falls back to requests' in-memory multipart
+    MultipartEncoder = None
 
 # Import custom components and utilities
-from utils.styling import inject_custom_css
+from utils.styling import inject_custom_css, render_score_card
+from utils.formatting import format_timestamp
 from components.header import render_header, render_hero_section, render_feature_cards
 
 
@@ -29,65 +47,180 @@ if _raw_api_url and not _raw_api_url.startswith(("http://", "https://")):
 else:
     API_BASE_URL = _raw_api_url
 
+_API_BASE = API_BASE_URL.rstrip("/")
+_API_TIMEOUT = int(os.getenv("API_TIMEOUT_SECONDS", "60"))
+# (connect, read): fail fast when the host is unreachable, stay patient for slow responses
+_API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT_SECONDS", "10"))
+_API_TIMEOUTS = (_API_CONNECT_TIMEOUT, _API_TIMEOUT)
 
-def format_timestamp(ts: str | None, include_ms: bool = False) -> str:
-    """Format ISO timestamp for display."""
-    if not ts:
-        return "N/A"
-    try:
-        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        if include_ms:
-            return dt.strftime("%H:%M:%S.%f")[:-3]
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        return ts
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Process-wide HTTP session: keeps TCP/TLS connections to the API alive across
+    calls, reruns and user sessions instead of paying a fresh handshake on every
+    request (notably status polling). Cached as a resource because Streamlit
+    re-executes this module on every rerun, which would rebuild a module global.
+    Only idempotent methods are retried; POSTs are never replayed.
+    """
+    session = requests.Session()
+    # Advertise only encodings urllib3 can decode here (br/zstd when their packages are installed)
+    session.headers.update(make_headers(accept_encoding=True))
+    session.headers["User-Agent"] = "vapc-frontend/1.0"
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Static page markup, built once at import rather than on every rerun
+_HOME_OVERVIEW_HTML = """
+    <div style="background: linear-gradient(135deg, #e7f3ff 0%, #f0f8ff 100%); padding: 28px; border-radius: 12px; border-left: 5px solid #0066cc; margin-bottom: 32px; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
+        <div style="display: flex; align-items: start; gap: 16px;">
+            <div style="font-size: 32px; line-height: 1;">🎯</div>
+            <div style="flex: 1;">
+                <p style="font-size: 17px; line-height: 1.7; color: #2c3e50; margin: 0 0 12px 0; font-weight: 500;">
+                    <strong>Automates pre-processing</strong> to ensure sufficient evidence before appraisal begins
+                </p>
+                <p style="font-size: 15px; line-height: 1.6; color: #495057; margin: 0;">
+                    Validates photo coverage, extracts vehicle data, checks completeness, and calculates readiness—preventing 
+                    incomplete submissions from reaching human appraisers.
+                </p>
+            </div>
+        </div>
+    </div>
+    """
+
+_STEP_TEMPLATE = """
+<div style="background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 16px; border-left: 4px solid #0066cc;">
+    <div style="display: flex; align-items: start; gap: 12px;">
+        <div style="background: #0066cc; color: white; width: 32px; height: 32px; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: 700; font-size: 16px; flex-shrink: 0;">
+            {number}
+        </div>
+        <div style="flex: 1;">
+            <div style="font-weight: 600; font-size: 16px; color: #2c3e50; margin-bottom: 4px;">
+                {title}
+            </div>
+            <div style="font-size: 14px; color: #6c757d; line-height: 1.5;">
+                {description}
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+_HOME_STEPS = [
+    {"number": "1", "title": "Create Appraisal", "description": "Enter vehicle details (year, make, model) and any notes"},
+    {"number": "2", "title": "Upload Photos", "description": "Upload up to 3 photos (front, rear, sides, interior, odometer, etc.)"},
+    {"number": "3", "title": "AI Analysis", "description": "System extracts data, checks completeness, and calculates readiness score (~2 minutes)"},
+    {"number": "4", "title": "Review Results", "description": "View readiness score, missing evidence, risk flags, and next steps"}
+]
+
+# Two-column grid of step cards, emitted as a single markdown block
+_HOME_STEPS_HTML = (
+    '<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 0 16px;">'
+    + "".join(_STEP_TEMPLATE.format(**step) for step in _HOME_STEPS)
+    + '</div>'
+)
+
+_PROCESSING_BANNER_HTML = """
+<div class="autograb-processing">
+    <h2>🔄 Processing</h2>
+    <p>
+        Analysis is in progress. Results will appear here automatically when ready (typically within 2 minutes).
+    </p>
+</div>
+"""
+
+_TAB_CSS = """
+    <style>
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 8px;
+        background-color: #f0f2f6;
+        padding: 8px;
+        border-radius: 8px;
+    }
+    .stTabs [data-baseweb="tab"] {
+        height: 50px;
+        padding: 10px 20px;
+        background-color: white;
+        border-radius: 6px;
+        font-weight: 600;
+        font-size: 16px;
+        border: 2px solid transparent;
+    }
+    .stTabs [aria-selected="true"] {
+        background-color: #0066cc;
+        color: white;
+        border-color: #0066cc;
+    }
+    .stTabs [aria-selected="false"] {
+        background-color: white;
+        color: #333;
+        border-color: #ddd;
+    }
+    </style>
+    """
+
+
+_EXT_TO_TYPE = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'heic': 'image/heic',
+    'heif': 'image/heif',
+}
+_ALLOWED_CT = frozenset(_EXT_TO_TYPE.values())
 
 
 def normalize_file_content_type(file, content_type: str | None) -> str:
-    """Normalize content type for file uploads."""
-    import mimetypes
-    
-    if content_type:
-        content_lower = content_type.lower()
-        if content_lower == "image/jpg":
-            return "image/jpeg"
-        if content_lower in ["image/jpeg", "image/png", "image/webp", "image/heic", "image/heif"]:
-            return content_lower
-    
-    if hasattr(file, 'name') and file.name:
-        guessed_type, _ = mimetypes.guess_type(file.name)
-        if guessed_type:
-            if guessed_type.lower() == "image/jpg":
-                return "image/jpeg"
-            return guessed_type.lower()
-        
-        ext = file.name.lower().split('.')[-1] if '.' in file.name else ''
-        ext_to_type = {
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'png': 'image/png',
-            'webp': 'image/webp',
-            'heic': 'image/heic',
-            'heif': 'image/heif',
-        }
-        if ext in ext_to_type:
-            return ext_to_type[ext]
+    """
+    Normalize content type for file uploads.
+    The extension table covers every type the uploader accepts, so no mimetypes lookup is needed.
+    """
+    ct = (content_type or "").lower()
+    if ct == "image/jpg":
+        ct = "image/jpeg"
+    if ct in _ALLOWED_CT:
+        return ct
+    
+    name = getattr(file, "name", "") or ""
+    if "." in name:
+        ext_type = _EXT_TO_TYPE.get(name.rpartition(".")[2].lower())
+        if ext_type:
+            return ext_type
     
     return content_type or "image/jpeg"
 
 
+def _is_dns_failure(exc: requests.exceptions.ConnectionError) -> bool:
+    """Check whether a ConnectionError was caused by host name resolution (socket.gaierror)."""
+    # requests wraps urllib3's MaxRetryError, whose .reason carries the underlying connect error
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    root = reason if reason is not None else exc
+    for _ in range(4):
+        if root is None:
+            return False
+        if isinstance(root, socket.gaierror):
+            return True
+        root = root.__cause__ or root.__context__
+    return False
+
+
 def call_api(method: str, endpoint: str, **kwargs) -> tuple[bool, Any]:
     """Make API call and return (success, data/error)."""
-    url = f"{API_BASE_URL}{endpoint}"
-    api_timeout = int(os.getenv("API_TIMEOUT_SECONDS", "60"))
-    
-    if "timeout" not in kwargs:
-        kwargs["timeout"] = api_timeout
+    url = _API_BASE + endpoint
+    kwargs.setdefault("timeout", _API_TIMEOUTS)
     
     try:
-        resp = requests.request(method, url, **kwargs)
+        resp = get_http_session().request(method, url, **kwargs)
         if resp.status_code < 400:
-            return True, resp.json()
+            return True, _json_loads(resp.content)
         else:
             # Handle specific server error codes (service unavailable/starting up)
             if resp.status_code in [502, 503, 504]:
@@ -106,7 +239,7 @@ def call_api(method: str, endpoint: str, **kwargs) -> tuple[bool, Any]:
             
             # Try to parse JSON error response, fallback to text
             try:
-                error_data = resp.json()
+                error_data = _json_loads(resp.content)
                 error_message = error_data.get("error", resp.text)
             except (ValueError, KeyError):
                 error_message = resp.text
@@ -115,16 +248,198 @@ def call_api(method: str, endpoint: str, **kwargs) -> tuple[bool, Any]:
                     error_message = f"Server error ({resp.status_code}). Please try again."
             return False, {"error": error_message, "status_code": resp.status_code}
     except requests.exceptions.Timeout:
-        return False, {"error": f"Request timeout after {api_timeout}s. The API may be starting up. Please wait 30-60 seconds and try again."}
+        return False, {"error": f"Request timeout after {_API_TIMEOUT}s. The API may be starting up. Please wait 30-60 seconds and try again."}
     except requests.exceptions.ConnectionError as e:
-        error_msg = str(e)
-        if "Name or service not known" in error_msg or "Failed to resolve" in error_msg:
+        if _is_dns_failure(e):
             return False, {"error": f"Cannot connect to API at {url}. Please check API_BASE_URL is set correctly."}
         return False, {"error": f"Connection error: The API may be starting up. Please wait 30-60 seconds and try again."}
     except Exception as e:
         return False, {"error": str(e)}
 
 
+def upload_photo(appraisal_id: str, uploaded_file) -> tuple[bool, Any]:
+    """
+    Upload a single Streamlit UploadedFile to the appraisal.
+    Uses a streaming multipart encoder when requests-toolbelt is available so the
+    body is sent in chunks rather than assembled in memory alongside the file.
+    """
+    content_type = normalize_file_content_type(uploaded_file, uploaded_file.type)
+    uploaded_file.seek(0)
+    endpoint = f"/api/appraisals/{appraisal_id}/photos/upload"
+    
+    if MultipartEncoder is None:
+        files = [("photo", (uploaded_file.name, uploaded_file, content_type))]
+        return call_api("POST", endpoint, files=files)
+    
+    encoder = MultipartEncoder(fields={"photo": (uploaded_file.name, uploaded_file, content_type)})
+    return call_api("POST", endpoint, data=encoder, headers={"Content-Type": encoder.content_type})
+
+
+def start_run(appraisal_id: str, photo_count: int) -> tuple[bool, Any]:
+    """
+    POST /run with an Idempotency-Key that stays stable for (appraisal, photo count)
+    until a run is accepted, so a double-click or retried rerun reuses the same run
+    server-side. Submits within a second of the previous one are not re-sent.
+    """
+    import uuid
+    
+    pending_key = f"_run_pending_{appraisal_id}"
+    if time.time() - st.session_state.get(pending_key, 0.0) < 1.0:
+        return False, {"error": "Analysis request already submitted. Please wait a moment."}
+    st.session_state[pending_key] = time.time()
+    
+    idem_key = f"_idem_{appraisal_id}_{photo_count}"
+    idempotency_key = st.session_state.setdefault(idem_key, str(uuid.uuid4()))
+    success, result = call_api(
+        "POST",
+        f"/api/appraisals/{appraisal_id}/run",
+        headers={"Idempotency-Key": idempotency_key},
+    )
+    if success:
+        # Next intentional run (e.g. after adding photos) gets a fresh key
+        st.session_state.pop(idem_key, None)
+    return success, result
+
+
+def upload_photos(appraisal_id: str, uploaded_files: list) -> list[tuple[Any, bool, Any]]:
+    """
+    Upload several files in parallel over the shared session.
+    Returns (uploaded_file, success, result) per file in completion order.
+    """
+    if len(uploaded_files) == 1:
+        return [(uploaded_files[0], *upload_photo(appraisal_id, uploaded_files[0]))]
+    
+    ctx = get_script_run_ctx()
+    
+    def _attach_ctx():
+        # call_api reaches the st.cache_resource session, which expects the script run context
+        add_script_run_ctx(ctx=ctx)
+    
+    results = []
+    with ThreadPoolExecutor(max_workers=3, initializer=_attach_ctx) as pool:
+        futures = {pool.submit(upload_photo, appraisal_id, f): f for f in uploaded_files}
+        for future in as_completed(futures):
+            success, result = future.result()
+            results.append((futures[future], success, result))
+    return results
+
+
+class _UncachedApiError(Exception):
+    """Raised from the cached GETs so st.cache_data skips storing failed responses."""
+    
+    def __init__(self, error: Any):
+        super().__init__(error)
+        self.error = error
+
+
+def _get_or_raise(endpoint: str) -> Any:
+    success, result = call_api("GET", endpoint)
+    if not success:
+        raise _UncachedApiError(result)
+    return result
+
+
+@st.cache_data(ttl=2, max_entries=128, show_spinner=False)
+def _cached_get_live(endpoint: str) -> Any:
+    """Cached GET for appraisals with a run in progress; the short TTL keeps polling fresh."""
+    return _get_or_raise(endpoint)
+
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
+def _cached_get_final(endpoint: str) -> Any:
+    """Cached GET for appraisals whose latest run is terminal; the payload no longer changes."""
+    return _get_or_raise(endpoint)
+
+
+def _cached_get(appraisal_id: str, endpoint: str) -> tuple[bool, Any]:
+    """
+    Route an appraisal GET through st.cache_data (the current caching primitive)
+    so widget interactions don't re-issue identical requests. Only successful
+    responses are cached; errors are retried on the next call.
+    """
+    cached_get = _cached_get_final if st.session_state.get(f"_run_terminal_{appraisal_id}") else _cached_get_live
+    try:
+        return True, cached_get(endpoint)
+    except _UncachedApiError as e:
+        return False, e.error
+
+
+def _fetch_appraisal(appraisal_id: str) -> tuple[bool, Any]:
+    """GET /api/appraisals/{id} via the appraisal cache."""
+    return _cached_get(appraisal_id, f"/api/appraisals/{appraisal_id}")
+
+
+def _fetch_photos(appraisal_id: str) -> tuple[bool, Any]:
+    """GET /api/appraisals/{id}/photos via the appraisal cache."""
+    return _cached_get(appraisal_id, f"/api/appraisals/{appraisal_id}/photos")
+
+
+def _fetch_ledger(appraisal_id: str) -> tuple[bool, Any]:
+    """GET /api/appraisals/{id}/ledger via the appraisal cache."""
+    return _cached_get(appraisal_id, f"/api/appraisals/{appraisal_id}/ledger")
+
+
+def _load_photos(appraisal_id: str) -> tuple[bool, Any]:
+    """
+    Photos for the appraisal currently on screen, fetched at most once per script run.
+    Stored alongside the appraisal payload in session state so tabs share one response.
+    """
+    payload = st.session_state.get("_appraisal_payload")
+    if payload and payload.get("appraisal_id") == appraisal_id:
+        if "photos" not in payload:
+            payload["photos"] = _fetch_photos(appraisal_id)
+        return payload["photos"]
+    return _fetch_photos(appraisal_id)
+
+
+def _fetch_appraisal_and_photos(appraisal_id: str) -> tuple[tuple[bool, Any], tuple[bool, Any]]:
+    """
+    Fetch the appraisal and its photos concurrently; the two GETs are independent
+    and share keep-alive connections from the session pool.
+    """
+    ctx = get_script_run_ctx()
+    
+    def _attach_ctx():
+        # Cached fetches expect the script run context on the calling thread
+        add_script_run_ctx(ctx=ctx)
+    
+    with ThreadPoolExecutor(max_workers=2, initializer=_attach_ctx) as pool:
+        appraisal_future = pool.submit(_fetch_appraisal, appraisal_id)
+        photos_future = pool.submit(_fetch_photos, appraisal_id)
+        return appraisal_future.result(), photos_future.result()
+
+
+_REQUIRED_ANGLES = ("front", "rear", "left", "right", "interior", "odometer")
+_REQUIRED_ANGLE_SET = frozenset(_REQUIRED_ANGLES)
+
+
+def _photo_angle_summary(photos: list[dict]) -> tuple:
+    """Hashable (photo_id, angle) summary of confidently detected angles, used as a cache key."""
+    summary = []
+    for photo in photos:
+        extraction = (photo.get("vision_output_json") or {}).get("extraction", {})
+        photo_angle = extraction.get("photo_angle", {})
+        angle = photo_angle.get("angle", "unknown")
+        if angle != "unknown" and photo_angle.get("confidence", 0.0) >= 0.7:
+            summary.append((photo.get("id"), angle.lower()))
+    return tuple(sorted(summary, key=str))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _compute_coverage(photos_key: str, photos_tuple: tuple) -> tuple[list, list]:
+    """Covered (sorted) and missing (required order) angles for a photo summary."""
+    detected = _REQUIRED_ANGLE_SET.intersection(angle for _, angle in photos_tuple)
+    return sorted(detected), [angle for angle in _REQUIRED_ANGLES if angle not in detected]
+
+
+def _invalidate_appraisal_cache(appraisal_id: str) -> None:
+    """Drop cached appraisal/photo responses after a write (upload or new run)."""
+    st.session_state.pop(f"_run_terminal_{appraisal_id}", None)
+    st.session_state.pop("_appraisal_payload", None)
+    _cached_get_live.clear()
+    _cached_get_final.clear()
+
+
 def main():
     st.set_page_config(
         page_title="Vehicle Appraisal Pre-Check",
@@ -199,22 +514,7 @@ def show_home_page():
     
     st.markdown("---")
     st.markdown("### What This Does")
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #e7f3ff 0%, #f0f8ff 100%); padding: 28px; border-radius: 12px; border-left: 5px solid #0066cc; margin-bottom: 32px; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
-        <div style="display: flex; align-items: start; gap: 16px;">
-            <div style="font-size: 32px; line-height: 1;">🎯</div>
-            <div style="flex: 1;">
-                <p style="font-size: 17px; line-height: 1.7; color: #2c3e50; margin: 0 0 12px 0; font-weight: 500;">
-                    <strong>Automates pre-processing</strong> to ensure sufficient evidence before appraisal begins
-                </p>
-                <p style="font-size: 15px; line-height: 1.6; color: #495057; margin: 0;">
-                    Validates photo coverage, extracts vehicle data, checks completeness, and calculates readiness—preventing 
-                    incomplete submissions from reaching human appraisers.
-                </p>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HOME_OVERVIEW_HTML, unsafe_allow_html=True)
     
     st.markdown("### Technologies Behind It")
     render_feature_cards()
@@ -222,35 +522,7 @@ def show_home_page():
     st.markdown("---")
     st.markdown("### How to Use")
     
-    steps = [
-        {"number": "1", "title": "Create Appraisal", "description": "Enter vehicle details (year, make, model) and any notes"},
-        {"number": "2", "title": "Upload Photos", "description": "Upload up to 3 photos (front, rear, sides, interior, odometer, etc.)"},
-        {"number": "3", "title": "AI Analysis", "description": "System extracts data, checks completeness, and calculates readiness score (~2 minutes)"},
-        {"number": "4", "title": "Review Results", "description": "View readiness score, missing evidence, risk flags, and next steps"}
-    ]
-    
-    step_cols = st.columns(2)
-    for i, step in enumerate(steps):
-        col = step_cols[i % 2]
-        with col:
-            step_html = f'''
-            <div style="background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 16px; border-left: 4px solid #0066cc;">
-                <div style="display: flex; align-items: start; gap: 12px;">
-                    <div style="background: #0066cc; color: white; width: 32px; height: 32px; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: 700; font-size: 16px; flex-shrink: 0;">
-                        {step["number"]}
-                    </div>
-                    <div style="flex: 1;">
-                        <div style="font-weight: 600; font-size: 16px; color: #2c3e50; margin-bottom: 4px;">
-                            {step["title"]}
-                        </div>
-                        <div style="font-size: 14px; color: #6c757d; line-height: 1.5;">
-                            {step["description"]}
-                        </div>
-                    </div>
-                </div>
-            </div>
-            '''
-            st.markdown(step_html, unsafe_allow_html=True)
+    st.markdown(_HOME_STEPS_HTML, unsafe_allow_html=True)
 
 
 def show_submission_form():
@@ -267,15 +539,7 @@ def show_submission_form():
     
     st.markdown('<h1 style="margin-bottom: 2rem;">Submit New Appraisal</h1>', unsafe_allow_html=True)
     
-    # Initialize session state for photo staging
-    if "staged_photos" not in st.session_state:
-        st.session_state["staged_photos"] = []
-    if "current_appraisal_id" not in st.session_state:
-        st.session_state["current_appraisal_id"] = None
-    if "appraisal_metadata" not in st.session_state:
-        st.session_state["appraisal_metadata"] = {}
-    if "upload_counter" not in st.session_state:
-        st.session_state["upload_counter"] = 0
+    # Photo staging keys are initialized once in main()
     
     # Step 1: Vehicle Metadata
     st.subheader("Step 1: Vehicle Information")
@@ -362,40 +626,53 @@ def show_submission_form():
         if "last_uploaded_filename" not in st.session_state:
             st.session_state["last_uploaded_filename"] = None
         
-        uploaded_file = st.file_uploader(
-            f"📸 Select photo to upload (max 3, currently {len(staged_photos)}/3)",
+        upload_failures = st.session_state.pop("upload_failures", None)
+        if upload_failures:
+            for name, error in upload_failures:
+                st.error(f"❌ Upload failed for {name}: {error}")
+            st.info("ℹ️ Re-select the failed photo(s) below to retry.")
+        
+        uploaded_files = st.file_uploader(
+            f"📸 Select photos to upload (max 3, currently {len(staged_photos)}/3)",
             type=["jpg", "jpeg", "png", "heic", "heif"],
-            accept_multiple_files=False,
+            accept_multiple_files=True,
             key=f"photo_uploader_{st.session_state['upload_counter']}",
             disabled=len(staged_photos) >= 3,
             label_visibility="visible"
         )
         
-        if uploaded_file is not None and len(staged_photos) < 3:
-            if st.session_state["last_uploaded_filename"] != uploaded_file.name:
-                st.session_state["last_uploaded_filename"] = uploaded_file.name
+        if uploaded_files and len(staged_photos) < 3:
+            uploaded_files = uploaded_files[:3 - len(staged_photos)]
+            upload_signature = "|".join(f.name for f in uploaded_files)
+            if st.session_state["last_uploaded_filename"] != upload_signature:
+                st.session_state["last_uploaded_filename"] = upload_signature
                 
-                with st.spinner(f"⬆️ Uploading {uploaded_file.name}..."):
-                    files = [("photo", (uploaded_file.name, uploaded_file, normalize_file_content_type(uploaded_file, uploaded_file.type)))]
-                    success, result = call_api(
-                        "POST",
-                        f"/api/appraisals/{appraisal_id}/photos/upload",
-                        files=files
-                    )
+                with st.spinner(f"⬆️ Uploading {len(uploaded_files)} photo(s)..."):
+                    results = upload_photos(appraisal_id, uploaded_files)
                 
-                if success:
-                    st.session_state["staged_photos"].append({
-                        "filename": uploaded_file.name,
-                        "artifact_id": result.get("artifact_id"),
-                        "status": "processing"
-                    })
+                failed = []
+                for uploaded_file, success, result in results:
+                    if success:
+                        st.session_state["staged_photos"].append({
+                            "filename": uploaded_file.name,
+                            "artifact_id": result.get("artifact_id"),
+                            "status": "processing"
+                        })
+                        st.toast(f"✅ {uploaded_file.name} uploaded!", icon="✅")
+                    else:
+                        failed.append((uploaded_file.name, result.get('error', 'Unknown error')))
+                
+                st.session_state["last_uploaded_filename"] = None
+                if failed and len(failed) == len(results):
+                    # Nothing was staged, so the selection can be retried as-is
+                    for name, error in failed:
+                        st.error(f"❌ Upload failed for {name}: {error}")
+                else:
+                    # Reset the uploader so files that already succeeded are not sent again;
+                    # failed ones are listed after the rerun for the user to re-select
+                    st.session_state["upload_failures"] = failed
                     st.session_state["upload_counter"] += 1
-                    st.session_state["last_uploaded_filename"] = None
-                    st.toast(f"✅ {uploaded_file.name} uploaded!", icon="✅")
                     st.rerun()
-                else:
-                    st.error(f"❌ Upload failed: {result.get('error', 'Unknown error')}")
-                    st.session_state["last_uploaded_filename"] = None
         
         if len(staged_photos) >= 3:
             st.warning("⚠️ Maximum 3 photos reached")
@@ -417,12 +694,7 @@ def show_submission_form():
             use_container_width=True
         ):
             with st.spinner("Starting AI analysis..."):
-                idempotency_key = str(uuid.uuid4())
-                success, result = call_api(
-                    "POST",
-                    f"/api/appraisals/{appraisal_id}/run",
-                    headers={"Idempotency-Key": idempotency_key},
-                )
+                success, result = start_run(appraisal_id, len(staged_photos))
             
             if success:
                 completed_appraisal_id = appraisal_id
@@ -513,12 +785,20 @@ def show_appraisal_viewer():
     appraisal_id = input_id.strip()
     
     with st.spinner("Loading appraisal..."):
-        success, data = call_api("GET", f"/api/appraisals/{appraisal_id}")
+        (success, data), photos_result = _fetch_appraisal_and_photos(appraisal_id)
     
     if not success:
         st.error(f"❌ Failed to load appraisal: {data.get('error', 'Unknown error')}")
         return
     
+    # Single source of truth for this run; tabs read from here instead of re-fetching
+    st.session_state["_appraisal_payload"] = {
+        "appraisal_id": appraisal_id,
+        "fetched_at": time.time(),
+        "data": data,
+        "photos": photos_result,
+    }
+    
     appraisal = data.get("appraisal", {})
     latest_run = data.get("latest_run")
     
@@ -527,28 +807,16 @@ def show_appraisal_viewer():
     metadata = appraisal.get("metadata_json", {})
     run_status = latest_run.get("status", "").upper() if latest_run else None
     is_running = run_status in ["PENDING", "RUNNING", "IN_PROGRESS"]
+    # Terminal status the status poller already observed (set right before its app rerun)
+    known_terminal = st.session_state.pop(f"_terminal_status_{short_id}", None)
+    if is_running and known_terminal:
+        # This payload predates the completion the poller saw; refetch once rather than resume polling
+        _invalidate_appraisal_cache(appraisal_id)
+        st.rerun()
+    st.session_state[f"_run_terminal_{appraisal_id}"] = not is_running
     
     if is_running:
         show_analysis_progress(latest_run, short_id)
-        # Auto-check every 2 seconds
-        if "last_status_check" not in st.session_state:
-            st.session_state["last_status_check"] = time.time()
-        
-        current_time = time.time()
-        if current_time - st.session_state["last_status_check"] >= 2:
-            st.session_state["last_status_check"] = current_time
-            # Re-check status
-            success, data = call_api("GET", f"/api/appraisals/{appraisal_id}")
-            if success:
-                latest_run_new = data.get("latest_run")
-                if latest_run_new:
-                    run_status_new = latest_run_new.get("status", "").upper()
-                    if run_status_new not in ["PENDING", "RUNNING", "IN_PROGRESS"]:
-                        st.rerun()
-                        return
-        
-        time.sleep(2)
-        st.rerun()
         return
     
     col_header1, col_header2 = st.columns([3, 1])
@@ -573,217 +841,29 @@ def show_appraisal_viewer():
         """, unsafe_allow_html=True)
     
     # Make tabs more visible with custom styling
-    st.markdown("""
-    <style>
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background-color: #f0f2f6;
-        padding: 8px;
-        border-radius: 8px;
-    }
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        padding: 10px 20px;
-        background-color: white;
-        border-radius: 6px;
-        font-weight: 600;
-        font-size: 16px;
-        border: 2px solid transparent;
-    }
-    .stTabs [aria-selected="true"] {
-        background-color: #0066cc;
-        color: white;
-        border-color: #0066cc;
-    }
-    .stTabs [aria-selected="false"] {
-        background-color: white;
-        color: #333;
-        border-color: #ddd;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_TAB_CSS, unsafe_allow_html=True)
+    
+    # Photos are fetched once per rerun (alongside the appraisal) and shared by both tabs
+    success_photos, photos_data = photos_result
+    photos = photos_data.get("photos", []) if success_photos else None
     
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Analysis Results", "📸 Photos", "📝 Notes & Details", "🔍 Event Log (Dev)"])
     
     with tab1:
         if latest_run and run_status == "COMPLETED":
-            display_run_results(latest_run, appraisal_id, metadata, appraisal)
+            display_run_results(latest_run, appraisal_id, metadata, appraisal, photos=photos)
         elif latest_run and run_status == "FAILED":
             st.error("❌ Analysis failed. Please try again or contact support.")
             if st.button("🔄 Refresh to Check Status", use_container_width=True):
                 st.rerun()
         else:
-            # Show processing status
-            st.markdown("""
-            <div style="background: linear-gradient(135deg, #e7f3ff 0%, #f0f8ff 100%); border: 2px solid #0066cc; border-radius: 12px; padding: 2rem; text-align: center; margin: 2rem 0;">
-                <h3 style="color: #0066cc; margin-bottom: 1rem;">🔄 Processing</h3>
-                <p style="font-size: 1rem; color: #333; margin: 0;">
-                    Analysis is in progress. Results will appear here automatically when ready (typically within 2 minutes).
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Auto-check every 2 seconds for completion
-            if "last_tab_check_time" not in st.session_state:
-                st.session_state["last_tab_check_time"] = time.time()
-            
-            current_time = time.time()
-            if current_time - st.session_state["last_tab_check_time"] >= 2:
-                st.session_state["last_tab_check_time"] = current_time
-                # Re-check status
-                success, data = call_api("GET", f"/api/appraisals/{appraisal_id}")
-                if success:
-                    latest_run_new = data.get("latest_run")
-                    if latest_run_new:
-                        run_status_new = latest_run_new.get("status", "").upper()
-                        if run_status_new in ["COMPLETED", "FAILED"]:
-                            st.rerun()
-                            return
-            
-            with st.spinner("Analyzing..."):
-                time.sleep(2)
+            # In-progress runs are polled by the outer is_running branch; nothing to poll here
+            st.info("No analysis results yet. Start an analysis to see results here.")
+            if st.button("🔄 Refresh", use_container_width=True, key="refresh_no_run"):
                 st.rerun()
     
     with tab2:
-        # Load photos first to get vision outputs
-        with st.spinner("Loading photos..."):
-            success_photos, photos_data = call_api("GET", f"/api/appraisals/{appraisal_id}/photos")
-        
-        if not success_photos:
-            st.error("Failed to load photos")
-            return
-        
-        photos = photos_data.get("photos", [])
-        
-        # Extract detected angles from vision outputs
-        detected_angles_set = set()
-        required_angles = ["front", "rear", "left", "right", "interior", "odometer"]
-        
-        for photo in photos:
-            vision_output = photo.get("vision_output_json")
-            if vision_output:
-                extraction = vision_output.get("extraction", {})
-                photo_angle = extraction.get("photo_angle", {})
-                angle = photo_angle.get("angle", "unknown")
-                confidence = photo_angle.get("confidence", 0.0)
-                if angle != "unknown" and confidence >= 0.7:
-                    angle_lower = angle.lower()
-                    if angle_lower in required_angles:
-                        detected_angles_set.add(angle_lower)
-        
-        detected_angles = sorted(list(detected_angles_set))
-        missing_angles = [angle for angle in required_angles if angle not in detected_angles_set]
-        
-        # Get photo coverage information from latest run (if completed)
-        if latest_run and run_status == "COMPLETED":
-            outputs = latest_run.get("outputs_json", {})
-            evidence_completeness = outputs.get("evidence_completeness", {})
-            covered_angles = evidence_completeness.get("covered_angles", [])
-            missing_angles = evidence_completeness.get("missing_angles", [])
-        else:
-            # Use detected angles from vision outputs
-            covered_angles = detected_angles
-        
-        # Display angle coverage status
-        st.markdown("### 📸 Photo Coverage Status")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if covered_angles:
-                st.markdown("**✅ Covered Angles:**")
-                for angle in covered_angles:
-                    st.markdown(f"  • {angle.title()}")
-            else:
-                st.info("No angles detected yet")
-        
-        with col2:
-            if missing_angles:
-                st.markdown("**❌ Missing Angles:**")
-                for angle in missing_angles:
-                    st.markdown(f"  • {angle.title()}")
-            else:
-                st.success("✅ All required angles covered!")
-        
-        # Add more photos section right after coverage status
-        st.markdown("---")
-        st.markdown("### ➕ Add More Photos")
-        
-        if len(photos) < 3:
-            st.info(f"You can add up to **{3 - len(photos)} more photo(s)** to improve coverage.")
-            
-            uploaded_file = st.file_uploader(
-                "📸 Select photo to upload",
-                type=["jpg", "jpeg", "png", "heic", "heif"],
-                accept_multiple_files=False,
-                key=f"additional_photo_uploader_{appraisal_id}",
-            )
-            
-            if uploaded_file is not None:
-                with st.spinner(f"⬆️ Uploading {uploaded_file.name}..."):
-                    files = [("photo", (uploaded_file.name, uploaded_file, normalize_file_content_type(uploaded_file, uploaded_file.type)))]
-                    success, result = call_api(
-                        "POST",
-                        f"/api/appraisals/{appraisal_id}/photos/upload",
-                        files=files
-                    )
-                
-                if success:
-                    st.success(f"✅ {uploaded_file.name} uploaded successfully!")
-                    st.info("💡 Click 'Reanalyze' below to include this photo in the analysis.")
-                    st.rerun()
-                else:
-                    st.error(f"❌ Upload failed: {result.get('error', 'Unknown error')}")
-        else:
-            st.success("✅ Maximum number of photos (3) already uploaded.")
-            # Still allow reanalyze even at max photos
-            uploaded_file = None
-        
-        # Reanalyze button - always show if we have photos
-        if len(photos) > 0:
-            reanalyze_clicked = st.button("🔄 Reanalyze with New Photos", type="primary", use_container_width=True, key=f"reanalyze_photos_{appraisal_id}")
-            if reanalyze_clicked:
-                with st.spinner("Starting reanalysis..."):
-                    idempotency_key = str(uuid.uuid4())
-                    success, result = call_api(
-                        "POST",
-                        f"/api/appraisals/{appraisal_id}/run",
-                        headers={"Idempotency-Key": idempotency_key},
-                    )
-                
-                if success:
-                    # Since we're already on view page, just refresh to show processing status
-                    st.session_state["last_appraisal_id"] = appraisal_id
-                    st.rerun()
-                else:
-                    st.error(f"❌ Failed to start reanalysis: {result.get('error', 'Unknown error')}")
-        
-        # Display photos
-        if photos:
-            st.markdown("---")
-            st.markdown(f"### 📷 Uploaded Photos ({len(photos)}/3)")
-            cols = st.columns(3)
-            for i, photo in enumerate(photos):
-                with cols[i % 3]:
-                    signed_url = photo.get("signed_url")
-                    vision_output = photo.get("vision_output_json", {})
-                    extraction = vision_output.get("extraction", {}) if vision_output else {}
-                    photo_angle = extraction.get("photo_angle", {}) if extraction else {}
-                    angle = photo_angle.get("angle", "unknown")
-                    confidence = photo_angle.get("confidence", 0.0)
-                    
-                    caption = f"Photo {i+1}"
-                    if angle != "unknown" and confidence >= 0.7:
-                        caption += f" - {angle.title()}"
-                    
-                    if signed_url:
-                        try:
-                            st.image(signed_url, use_container_width=True, caption=caption)
-                        except Exception:
-                            st.write(f"📷 {caption} (preview unavailable)")
-                    else:
-                        st.write(f"📷 {caption}")
-        else:
-            st.info("No photos uploaded yet")
+        show_photos_tab(appraisal_id, photos, latest_run, run_status)
     
     with tab3:
         st.subheader("Vehicle Information")
@@ -816,45 +896,227 @@ def show_appraisal_viewer():
             show_ledger_viewer(appraisal_id)
 
 
+@st.fragment
+def show_photos_tab(appraisal_id: str, photos: list | None, latest_run: dict | None, run_status: str | None):
+    """Photos tab: coverage status, add-more-photos upload and the photo grid. Reruns on its own."""
+    if photos is None:
+        st.error("Failed to load photos")
+        return
+    
+    # Get photo coverage information from latest run (if completed)
+    if latest_run and run_status == "COMPLETED":
+        outputs = latest_run.get("outputs_json", {})
+        evidence_completeness = outputs.get("evidence_completeness", {})
+        covered_angles = evidence_completeness.get("covered_angles", [])
+        missing_angles = evidence_completeness.get("missing_angles", [])
+    else:
+        # Use detected angles from vision outputs
+        covered_angles, missing_angles = _compute_coverage(appraisal_id, _photo_angle_summary(photos))
+    
+    # Display angle coverage status
+    st.markdown("### 📸 Photo Coverage Status")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if covered_angles:
+            st.markdown("**✅ Covered Angles:**")
+            for angle in covered_angles:
+                st.markdown(f"  • {angle.title()}")
+        else:
+            st.info("No angles detected yet")
+    
+    with col2:
+        if missing_angles:
+            st.markdown("**❌ Missing Angles:**")
+            for angle in missing_angles:
+                st.markdown(f"  • {angle.title()}")
+        else:
+            st.success("✅ All required angles covered!")
+    
+    # Add more photos section right after coverage status
+    st.markdown("---")
+    st.markdown("### ➕ Add More Photos")
+    
+    if len(photos) < 3:
+        st.info(f"You can add up to **{3 - len(photos)} more photo(s)** to improve coverage.")
+        
+        uploaded_files = st.file_uploader(
+            "📸 Select photos to upload",
+            type=["jpg", "jpeg", "png", "heic", "heif"],
+            accept_multiple_files=True,
+            key=f"additional_photo_uploader_{appraisal_id}",
+        )
+
+        if uploaded_files:
+            uploaded_files = uploaded_files[:3 - len(photos)]
+            with st.spinner(f"⬆️ Uploading {len(uploaded_files)} photo(s)..."):
+                results = upload_photos(appraisal_id, uploaded_files)
+            
+            failed = [(f.name, result.get('error', 'Unknown error')) for f, success, result in results if not success]
+            if len(failed) < len(results):
+                _invalidate_appraisal_cache(appraisal_id)
+            if not failed:
+                st.success(f"✅ {len(results)} photo(s) uploaded successfully!")
+                st.info("💡 Click 'Reanalyze' below to include these photos in the analysis.")
+                st.rerun()
+            for name, error in failed:
+                st.error(f"❌ Upload failed for {name}: {error}")
+    else:
+        st.success("✅ Maximum number of photos (3) already uploaded.")
+        # Still allow reanalyze even at max photos
+        uploaded_files = None
+    
+    # Reanalyze button - always show if we have photos
+    if len(photos) > 0:
+        reanalyze_clicked = st.button("🔄 Reanalyze with New Photos", type="primary", use_container_width=True, key=f"reanalyze_photos_{appraisal_id}")
+        if reanalyze_clicked:
+            with st.spinner("Starting reanalysis..."):
+                success, result = start_run(appraisal_id, len(photos))
+            
+            if success:
+                # Since we're already on view page, just refresh to show processing status
+                _invalidate_appraisal_cache(appraisal_id)
+                st.session_state["last_appraisal_id"] = appraisal_id
+                st.rerun()
+            else:
+                st.error(f"❌ Failed to start reanalysis: {result.get('error', 'Unknown error')}")
+    
+    # Display photos
+    if photos:
+        st.markdown("---")
+        st.markdown(f"### 📷 Uploaded Photos ({len(photos)}/3)")
+        cols = st.columns(3)
+        for i, photo in enumerate(photos):
+            with cols[i % 3]:
+                # Prefer the resized preview; fall back to the original when thumbnails are off
+                signed_url = photo.get("thumbnail_url") or photo.get("signed_url")
+                vision_output = photo.get("vision_output_json", {})
+                extraction = vision_output.get("extraction", {}) if vision_output else {}
+                photo_angle = extraction.get("photo_angle", {}) if extraction else {}
+                angle = photo_angle.get("angle", "unknown")
+                confidence = photo_angle.get("confidence", 0.0)
+                
+                caption = f"Photo {i+1}"
+                if angle != "unknown" and confidence >= 0.7:
+                    caption += f" - {angle.title()}"
+                
+                if signed_url:
+                    # Raw <img> so the browser lazy-loads and decodes off the main thread
+                    st.markdown(
+                        f'<img src="{html.escape(signed_url, quote=True)}" loading="lazy" decoding="async" '
+                        f'alt="{caption}" style="width: 100%; border-radius: 4px;">'
+                        f'<div style="text-align: center; font-size: 14px; color: #808495;">{caption}</div>',
+                        unsafe_allow_html=True,
+                    )
+                else:
+                    st.write(f"📷 {caption}")
+    else:
+        st.info("No photos uploaded yet")
+
+
 def show_analysis_progress(run: dict[str, Any], appraisal_id: str):
     """Display processing status for analysis."""
     st.markdown("---")
     
     # Show processing status banner
-    st.markdown("""
-    <div style="background: linear-gradient(135deg, #e7f3ff 0%, #f0f8ff 100%); border: 2px solid #0066cc; border-radius: 12px; padding: 2rem; text-align: center; margin: 2rem 0;">
-        <h2 style="color: #0066cc; margin-bottom: 1rem;">🔄 Processing</h2>
-        <p style="font-size: 1.1rem; color: #333; margin: 0;">
-            Analysis is in progress. Results will appear here automatically when ready (typically within 2 minutes).
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_PROCESSING_BANNER_HTML, unsafe_allow_html=True)
     
-    # Show spinner
-    with st.spinner("Analyzing your appraisal..."):
-        # Auto-check every 2 seconds
-        if "last_progress_check" not in st.session_state:
-            st.session_state["last_progress_check"] = time.time()
-        
-        current_time = time.time()
-        if current_time - st.session_state["last_progress_check"] >= 2:
-            st.session_state["last_progress_check"] = current_time
-            # Re-check status
-            success, data = call_api("GET", f"/api/appraisals/{appraisal_id}")
-            if success:
-                latest_run_new = data.get("latest_run")
-                if latest_run_new:
-                    run_status_new = latest_run_new.get("status", "").upper()
-                    if run_status_new not in ["PENDING", "RUNNING", "IN_PROGRESS"]:
-                        st.rerun()
-                        return
-        
-        time.sleep(2)
+    _poll_run_status(appraisal_id)
+
+
+def _conditional_get(endpoint: str, etag: str | None) -> tuple[int, Any, str | None]:
+    """
+    GET with If-None-Match. Returns (status_code, data, etag); status 304 means
+    the resource is unchanged and carries no body, 0 means the request failed.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        resp = get_http_session().get(_API_BASE + endpoint, headers=headers, timeout=_API_TIMEOUTS)
+    except requests.exceptions.RequestException:
+        return 0, None, etag
+    if resp.status_code == 304:
+        return 304, None, etag
+    if resp.status_code >= 400:
+        return resp.status_code, None, etag
+    try:
+        return resp.status_code, _json_loads(resp.content), resp.headers.get("ETag")
+    except ValueError:
+        return 0, None, etag
+
+
+_POLL_MIN_DELAY_S = 1.0
+_POLL_MAX_DELAY_S = 15.0
+
+
+@st.fragment(run_every="1s")
+def _poll_run_status(appraisal_id: str):
+    """
+    Poll run status without re-executing the whole page.
+    Only this fragment reruns per tick; once the run leaves the in-progress
+    states a single full-app rerun swaps in the results view.
+    Polls are conditional GETs against the lightweight /status endpoint with
+    exponential backoff (1s doubling to 15s, reset whenever the status changes,
+    doubled again on HTTP 429); ticks that fall inside the backoff window make
+    no request.
+    """
+    state_key = f"_status_poll_{appraisal_id}"
+    poll_state = st.session_state.setdefault(state_key, {"delay": _POLL_MIN_DELAY_S, "next_at": 0.0})
+    
+    now = time.time()
+    if now < poll_state["next_at"]:
+        st.caption(f"⏳ Status: {poll_state.get('status') or 'PENDING'} • next check in {poll_state['next_at'] - now:.0f}s")
+        return
+    
+    status_code, data, etag = _conditional_get(f"/api/appraisals/{appraisal_id}/status", poll_state.get("etag"))
+    run_status = poll_state.get("status")
+    if data is not None:
+        run_status = (data.get("status") or "").upper() or None
+        poll_state["etag"] = etag
+    
+    if status_code in (200, 304) and run_status != poll_state.get("status"):
+        poll_state["delay"] = _POLL_MIN_DELAY_S
+    else:
+        poll_state["delay"] = min(poll_state["delay"] * 2, _POLL_MAX_DELAY_S)
+        if status_code == 429:
+            poll_state["delay"] *= 2
+    poll_state["status"] = run_status
+    poll_state["next_at"] = now + poll_state["delay"]
+    
+    if status_code not in (200, 304):
+        st.caption("⚠️ Could not refresh status, retrying...")
+        return
+    
+    if run_status in ["COMPLETED", "FAILED"]:
+        st.session_state.pop(state_key, None)
+        _invalidate_appraisal_cache(appraisal_id)
+        # Recorded before the rerun so the viewer goes straight to results
+        st.session_state[f"_terminal_status_{appraisal_id}"] = run_status
+        st.session_state[f"_run_terminal_{appraisal_id}"] = True
         st.rerun()
+    
+    st.caption(f"⏳ Status: {run_status or 'PENDING'} • checked {time.strftime('%H:%M:%S')}")
+
 
+_BREAKDOWN_CATEGORIES = (
+    ("angle_coverage", "📸 Photo Coverage"),
+    ("odometer_confidence", "⏲️ Odometer"),
+    ("vin_presence", "🔑 VIN"),
+    ("notes_consistency", "📝 Notes Quality"),
+)
 
-def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict = None, appraisal: dict = None):
-    """Display results for a pipeline run."""
+# (floor percentage, icon, style.css tier class), highest floor first
+_PCT_TIERS = (
+    (80, "✅", "good"),
+    (50, "⚠️", "warn"),
+    (float("-inf"), "❌", "bad"),
+)
+
+_SEVERITY_ICONS = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+
+
+@st.fragment
+def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict = None, appraisal: dict = None, photos: list | None = None):
+    """Display results for a pipeline run. photos, when given, is the list already fetched by the caller."""
     if metadata is None:
         metadata = {}
     if appraisal is None:
@@ -882,15 +1144,7 @@ def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict =
     col1, col2 = st.columns([1, 2])
     
     with col1:
-        score_color = "#28a745" if score >= 80 else ("#ffc107" if score >= 50 else "#dc3545")
-        score_html = f'''
-        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, {score_color}22 0%, {score_color}11 100%); border-radius: 15px; border: 3px solid {score_color};">
-            <div style="font-size: 64px; font-weight: bold; color: {score_color}; line-height: 1;">{score}</div>
-            <div style="font-size: 24px; color: #666; margin-top: 5px;">/ 100</div>
-            <div style="font-size: 14px; color: #888; margin-top: 10px; text-transform: uppercase; letter-spacing: 1px;">Readiness Score</div>
-        </div>
-        '''
-        st.markdown(score_html, unsafe_allow_html=True)
+        st.markdown(render_score_card(score), unsafe_allow_html=True)
         
         photo_count = evidence_completeness.get("photo_count", 0)
         covered_angles = evidence_completeness.get("covered_angles", [])
@@ -920,42 +1174,27 @@ def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict =
     breakdown = decision.get("breakdown", {})
     if breakdown:
         with st.expander("📋 **View Detailed Evidence Breakdown**", expanded=False):
-            categories = [
-                ("angle_coverage", "📸 Photo Coverage"),
-                ("odometer_confidence", "⏲️ Odometer"),
-                ("vin_presence", "🔑 VIN"),
-                ("notes_consistency", "📝 Notes Quality"),
-            ]
-            
-            for cat_key, cat_title in categories:
+            for cat_key, cat_title in _BREAKDOWN_CATEGORIES:
                 if cat_key in breakdown:
                     details = breakdown[cat_key]
                     score_val = details.get("score", 0)
                     max_val = details.get("max_score", 1)
                     percentage = (score_val / max_val * 100) if max_val > 0 else 0
                     
-                    if percentage >= 80:
-                        status_icon = "✅"
-                        status_color = "#28a745"
-                    elif percentage >= 50:
-                        status_icon = "⚠️"
-                        status_color = "#ffc107"
-                    else:
-                        status_icon = "❌"
-                        status_color = "#dc3545"
+                    status_icon, status_tier = next((icon, tier) for floor, icon, tier in _PCT_TIERS if percentage >= floor)
                     
-                    col_title, col_bar = st.columns([1, 3])
-                    with col_title:
-                        st.markdown(f"**{status_icon} {cat_title.split(' ', 1)[1] if ' ' in cat_title else cat_title}**")
-                    with col_bar:
-                        progress_html = f'''
-                        <div style="background: #e9ecef; height: 24px; border-radius: 12px; overflow: hidden; margin-top: 3px;">
-                            <div style="background: {status_color}; width: {percentage}%; height: 100%; display: flex; align-items: center; justify-content: flex-start; padding-left: 10px; color: white; font-weight: 600; font-size: 12px;">
-                                {score_val}/{max_val} ({percentage:.0f}%)
-                            </div>
-                        </div>
-                        '''
-                        st.markdown(progress_html, unsafe_allow_html=True)
+                    # Title and progress bar share one CSS grid row: one delta, no st.columns
+                    label = cat_title.split(' ', 1)[1] if ' ' in cat_title else cat_title
+                    st.markdown(f'''
+<div class="autograb-breakdown-row autograb-{status_tier}">
+    <div class="autograb-breakdown-title">{status_icon} {label}</div>
+    <div class="autograb-progressbar">
+        <div class="autograb-progressbar-fill" style="width: {percentage}%;">
+            {score_val}/{max_val} ({percentage:.0f}%)
+        </div>
+    </div>
+</div>
+''', unsafe_allow_html=True)
                     
                     # Add detailed information for angle_coverage (similar to Photos tab)
                     if cat_key == "angle_coverage":
@@ -965,24 +1204,26 @@ def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict =
                         missing_angles_list = evidence_completeness.get("missing_angles", [])
                         
                         if covered_angles_list or missing_angles_list:
-                            detail_col1, detail_col2 = st.columns(2)
-                            with detail_col1:
-                                if covered_angles_list:
-                                    st.markdown("**✅ Covered Angles:**")
-                                    for angle in covered_angles_list:
-                                        confidence = angle_details.get(angle, {}).get("confidence", 0.0) if angle_details else 0.0
-                                        conf_percent = int(confidence * 100)
-                                        st.markdown(f"  • {angle.title()} ({conf_percent}% confidence)")
-                                else:
-                                    st.info("No angles covered")
-                            
-                            with detail_col2:
-                                if missing_angles_list:
-                                    st.markdown("**❌ Missing Angles:**")
-                                    for angle in missing_angles_list:
-                                        st.markdown(f"  • {angle.title()}")
-                                else:
-                                    st.success("All required angles covered!")
+                            # Covered/missing lists share one CSS grid: one delta instead of two columns
+                            if covered_angles_list:
+                                covered_items = []
+                                for angle in covered_angles_list:
+                                    confidence = angle_details.get(angle, {}).get("confidence", 0.0) if angle_details else 0.0
+                                    conf_percent = int(confidence * 100)
+                                    covered_items.append(f"<li>{html.escape(angle.title())} ({conf_percent}% confidence)</li>")
+                                covered_items = "".join(covered_items)
+                                covered_html = f"<strong>✅ Covered Angles:</strong><ul>{covered_items}</ul>"
+                            else:
+                                covered_html = '<div class="autograb-note info">No angles covered</div>'
+                            if missing_angles_list:
+                                missing_items = "".join(f"<li>{html.escape(angle.title())}</li>" for angle in missing_angles_list)
+                                missing_html = f"<strong>❌ Missing Angles:</strong><ul>{missing_items}</ul>"
+                            else:
+                                missing_html = '<div class="autograb-note success">All required angles covered!</div>'
+                            st.markdown(
+                                f'<div class="autograb-detail-grid"><div>{covered_html}</div><div>{missing_html}</div></div>',
+                                unsafe_allow_html=True,
+                            )
                     
                     # Add details for odometer
                     elif cat_key == "odometer_confidence":
@@ -1011,27 +1252,23 @@ def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict =
     risk_flags = risk_data.get("flags", [])
     if risk_flags:
         with st.expander(f"⚠️ **Risk Flags Detected ({len(risk_flags)})**", expanded=True):
+            flag_parts = []
             for flag in risk_flags:
                 severity = flag.get("severity", "low").lower()
                 code = flag.get("code", "unknown")
                 message = flag.get("message", "")
                 
-                if severity == "high":
-                    severity_icon = "🔴"
-                    severity_color = "#dc3545"
-                elif severity == "medium":
-                    severity_icon = "🟡"
-                    severity_color = "#ffc107"
-                else:
-                    severity_icon = "🟢"
-                    severity_color = "#28a745"
+                if severity not in _SEVERITY_ICONS:
+                    severity = "low"
+                severity_icon = _SEVERITY_ICONS[severity]
                 
-                st.markdown(f"""
-                <div style="padding: 10px; border-left: 3px solid {severity_color}; background: {severity_color}11; margin-bottom: 10px; border-radius: 4px;">
-                    <div style="font-weight: 600; color: {severity_color};">{severity_icon} {code.replace('_', ' ').title()}</div>
-                    <div style="color: #555; font-size: 13px; margin-top: 4px;">{message}</div>
-                </div>
-                """, unsafe_allow_html=True)
+                flag_parts.append(f"""
+<div class="autograb-riskflag {severity}">
+    <div class="autograb-riskflag-title">{severity_icon} {code.replace('_', ' ').title()}</div>
+    <div class="autograb-riskflag-message">{message}</div>
+</div>""")
+            
+            st.markdown("\n".join(flag_parts), unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     st.caption(f"Analysis completed: {format_timestamp(run.get('completed_at'))}")
@@ -1041,52 +1278,49 @@ def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict =
     st.markdown("### ➕ Add More Photos to Improve Coverage")
     
     # Get current photo count
-    with st.spinner("Loading photos..."):
-        success_photos, photos_data = call_api("GET", f"/api/appraisals/{appraisal_id}/photos")
+    if photos is None:
+        with st.spinner("Loading photos..."):
+            success_photos, photos_data = _load_photos(appraisal_id)
+        if success_photos:
+            photos = photos_data.get("photos", [])
     
-    if success_photos:
-        photos = photos_data.get("photos", [])
+    if photos is not None:
         photo_count = len(photos)
         
         if photo_count < 3:
             st.info(f"You can add up to **{3 - photo_count} more photo(s)** to improve evidence coverage and potentially increase your readiness score.")
             
-            uploaded_file = st.file_uploader(
-                "📸 Select photo to upload",
+            uploaded_files = st.file_uploader(
+                "📸 Select photos to upload",
                 type=["jpg", "jpeg", "png", "heic", "heif"],
-                accept_multiple_files=False,
+                accept_multiple_files=True,
                 key=f"analysis_tab_photo_uploader_{appraisal_id}",
             )
-            
-            if uploaded_file is not None:
-                with st.spinner(f"⬆️ Uploading {uploaded_file.name}..."):
-                    files = [("photo", (uploaded_file.name, uploaded_file, normalize_file_content_type(uploaded_file, uploaded_file.type)))]
-                    success, result = call_api(
-                        "POST",
-                        f"/api/appraisals/{appraisal_id}/photos/upload",
-                        files=files
-                    )
+
+            if uploaded_files:
+                uploaded_files = uploaded_files[:3 - photo_count]
+                with st.spinner(f"⬆️ Uploading {len(uploaded_files)} photo(s)..."):
+                    results = upload_photos(appraisal_id, uploaded_files)
                 
-                if success:
-                    st.success(f"✅ {uploaded_file.name} uploaded successfully!")
-                    st.info("💡 Click 'Reanalyze' below to include this photo in a new analysis.")
+                failed = [(f.name, result.get('error', 'Unknown error')) for f, success, result in results if not success]
+                if len(failed) < len(results):
+                    _invalidate_appraisal_cache(appraisal_id)
+                if not failed:
+                    st.success(f"✅ {len(results)} photo(s) uploaded successfully!")
+                    st.info("💡 Click 'Reanalyze' below to include these photos in a new analysis.")
                     st.rerun()
-                else:
-                    st.error(f"❌ Upload failed: {result.get('error', 'Unknown error')}")
+                for name, error in failed:
+                    st.error(f"❌ Upload failed for {name}: {error}")
             
             # Reanalyze button
             reanalyze_clicked = st.button("🔄 Reanalyze with New Photos", type="primary", use_container_width=True, key=f"reanalyze_from_results_{appraisal_id}")
             if reanalyze_clicked:
                 with st.spinner("Starting reanalysis..."):
-                    idempotency_key = str(uuid.uuid4())
-                    success, result = call_api(
-                        "POST",
-                        f"/api/appraisals/{appraisal_id}/run",
-                        headers={"Idempotency-Key": idempotency_key},
-                    )
+                    success, result = start_run(appraisal_id, photo_count)
                 
                 if success:
                     # Since we're already on view page, just refresh to show processing status
+                    _invalidate_appraisal_cache(appraisal_id)
                     st.session_state["last_appraisal_id"] = appraisal_id
                     st.rerun()
                 else:
@@ -1095,10 +1329,34 @@ def display_run_results(run: dict[str, Any], appraisal_id: str, metadata: dict =
             st.success("✅ Maximum number of photos (3) already uploaded.")
 
 
+_LEDGER_NODE_INFO = {
+    "agent_start": {"name": "🚀 Agent Started", "color": "#4CAF50"},
+    "agent_tool_extract_vision_from_photo": {"name": "📸 Vision Analysis", "color": "#2196F3"},
+    "agent_tool_extract_vision_from_photos_batch": {"name": "📸 Vision Analysis (batch)", "color": "#2196F3"},
+    "agent_tool_check_evidence_completeness": {"name": "📋 Evidence Check", "color": "#FF9800"},
+    "agent_tool_retrieve_similar_appraisals": {"name": "🔍 RAG Search", "color": "#9C27B0"},
+    "agent_tool_scan_for_risks": {"name": "⚠️ Risk Assessment", "color": "#F44336"},
+    "agent_tool_calculate_readiness_score": {"name": "🎯 Decision Score", "color": "#9C27B0"},
+    "agent_complete": {"name": "✅ Analysis Complete", "color": "#4CAF50"},
+}
+
+_LEDGER_CARD_TEMPLATE = """
+<div class="autograb-timeline-item" style="--node-color: {color};">
+    <div class="autograb-timeline-dot">{index}</div>
+    <div class="autograb-timeline-card">
+        <div class="autograb-timeline-head">
+            <div class="autograb-timeline-title">{status_icon} {display_name}</div>
+            <div class="autograb-timeline-time">{timestamp}</div>
+        </div>
+    </div>
+</div>"""
+
+
+@st.fragment
 def show_ledger_infographic(appraisal_id: str):
     """Display visual infographic of pipeline execution flow."""
     with st.spinner("Loading pipeline flow..."):
-        success, data = call_api("GET", f"/api/appraisals/{appraisal_id}/ledger")
+        success, data = _fetch_ledger(appraisal_id)
     
     if not success:
         st.error(f"Failed to load ledger: {data.get('error')}")
@@ -1109,52 +1367,45 @@ def show_ledger_infographic(appraisal_id: str):
         st.info("No pipeline events found")
         return
     
-    node_info = {
-        "agent_start": {"name": "🚀 Agent Started", "color": "#4CAF50"},
-        "agent_tool_extract_vision_from_photo": {"name": "📸 Vision Analysis", "color": "#2196F3"},
-        "agent_tool_check_evidence_completeness": {"name": "📋 Evidence Check", "color": "#FF9800"},
-        "agent_tool_retrieve_similar_appraisals": {"name": "🔍 RAG Search", "color": "#9C27B0"},
-        "agent_tool_scan_for_risks": {"name": "⚠️ Risk Assessment", "color": "#F44336"},
-        "agent_tool_calculate_readiness_score": {"name": "🎯 Decision Score", "color": "#9C27B0"},
-        "agent_complete": {"name": "✅ Analysis Complete", "color": "#4CAF50"},
-    }
-    
     st.markdown("### 📊 Agent Execution Flow")
     
+    cards = []
     for i, event in enumerate(events, 1):
         node = event.get("node_name", "unknown")
-        status = event.get("status", "ok")
-        timestamp = event.get("timestamp", "")
-        
-        info = node_info.get(node, {
+        info = _LEDGER_NODE_INFO.get(node) or {
             "name": node.replace("_", " ").title(),
             "color": "#757575",
-        })
-        
-        display_name = info["name"]
-        color = info["color"]
-        status_icon = "✅" if status == "ok" else "❌"
-        
-        card_html = f'''
-        <div style="display: flex; align-items: stretch; margin-bottom: 12px;">
-            <div style="flex-shrink: 0; width: 35px; height: 35px; border-radius: 50%; background: {color}; display: flex; align-items: center; justify-content: center; color: white; font-weight: bold; font-size: 14px; align-self: center;">
-                {i}
-            </div>
-            <div style="flex-grow: 1; margin-left: 12px; padding: 10px 12px; background: white; border-radius: 6px; border-left: 3px solid {color}; box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
-                <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 4px;">
-                    <div style="font-weight: 600; font-size: 14px;">{status_icon} {display_name}</div>
-                    <div style="font-size: 11px; color: #666; font-family: monospace; white-space: nowrap; margin-left: 12px;">{format_timestamp(timestamp, include_ms=True)}</div>
-                </div>
-            </div>
-        </div>
-        '''
-        st.markdown(card_html, unsafe_allow_html=True)
+        }
+        cards.append(_LEDGER_CARD_TEMPLATE.format(
+            index=i,
+            color=info["color"],
+            status_icon="✅" if event.get("status", "ok") == "ok" else "❌",
+            display_name=info["name"],
+            timestamp=format_timestamp(event.get("timestamp", ""), include_ms=True),
+        ))
+    
+    # Whole flow in one markdown delta instead of one per event
+    st.markdown("<div>" + "".join(cards) + "</div>", unsafe_allow_html=True)
+
 
+_RAW_PAYLOAD_PREVIEW_CHARS = 2000
 
+
+@st.fragment
 def show_ledger_viewer(appraisal_id: str):
-    """Display full ledger event log."""
+    """
+    Display full ledger event log.
+    Nothing is fetched or rendered until the user asks for it, and large payloads
+    show a truncated preview until expanded individually.
+    """
+    loaded_key = f"_raw_ledger_loaded_{appraisal_id}"
+    if not st.session_state.get(loaded_key):
+        if not st.button("📂 Load raw events", key=f"load_raw_ledger_{appraisal_id}"):
+            return
+        st.session_state[loaded_key] = True
+    
     with st.spinner("Loading ledger..."):
-        success, data = call_api("GET", f"/api/appraisals/{appraisal_id}/ledger")
+        success, data = _fetch_ledger(appraisal_id)
     
     if not success:
         st.error(f"Failed to load ledger: {data.get('error')}")
@@ -1167,27 +1418,34 @@ def show_ledger_viewer(appraisal_id: str):
     
     st.write(f"**Total Events:** {len(events)}")
     
-    for i, event in enumerate(events, 1):
-        node_name = event.get("node_name", "unknown")
-        timestamp = format_timestamp(event.get("timestamp"))
-        output = event.get("output", {})
-        status = event.get("status", "unknown")
-        error = event.get("error")
-        
-        status_icon = "✅" if status == "ok" else "❌"
-        
-        st.markdown(f"**{status_icon} {node_name}** - `{timestamp}`")
-        if output:
-            with st.container():
-                st.json(output)
-        else:
-            st.info("No output data available")
-        
-        if error:
-            st.error(f"Error: {error}")
-        
-        if i < len(events):
-            st.markdown("---")
+    with st.container():
+        for i, event in enumerate(events, 1):
+            node_name = event.get("node_name", "unknown")
+            timestamp = format_timestamp(event.get("timestamp"))
+            output = event.get("output", {})
+            status = event.get("status", "unknown")
+            error = event.get("error")
+            
+            status_icon = "✅" if status == "ok" else "❌"
+            
+            # Separator folded into the header: one delta per event instead of two
+            separator = "---\n\n" if i > 1 else ""
+            st.markdown(f"{separator}**{status_icon} {node_name}** - `{timestamp}`")
+            if output:
+                full_key = f"_raw_event_full_{appraisal_id}_{i}"
+                payload = json.dumps(output, indent=2, default=str)
+                if len(payload) <= _RAW_PAYLOAD_PREVIEW_CHARS or st.session_state.get(full_key):
+                    st.json(output)
+                else:
+                    st.code(payload[:_RAW_PAYLOAD_PREVIEW_CHARS] + "\n…", language="json")
+                    if st.button("Show full payload", key=f"show_full_{appraisal_id}_{i}"):
+                        st.session_state[full_key] = True
+                        st.rerun(scope="fragment")
+            else:
+                st.info("No output data available")
+            
+            if error:
+                st.error(f"Error: {error}")
 
 
 if __name__ == "__main__":
@@ -3,17 +3,63 @@ Header and navigation component for Vehicle Appraisal UI.
 """
 import streamlit as st
 
+_HEADER_HTML = '''
+<div class="autograb-header">
+    <div class="autograb-header-container">
+        <div class="autograb-logo">Vehicle Appraisal Pre-Check</div>
+    </div>
+</div>
+'''
+
+_HERO_HTML = '''
+<div class="autograb-hero">
+    <h1>Automated Appraisal Pre-Processing</h1>
+    <p class="autograb-hero-subtitle">
+        Ensure sufficient evidence is collected <strong>before</strong> actual appraisal begins.
+        <br>AI-powered validation that saves time and prevents incomplete submissions.
+    </p>
+    <div class="autograb-hero-cta">
+    </div>
+'''
+
+_FEATURES = [
+    {
+        "icon": "📸",
+        "title": "AI Vision Extraction",
+        "description": "GPT-4 Vision analyzes photos to extract angles, odometer, VIN, and damage"
+    },
+    {
+        "icon": "🔍",
+        "title": "RAG-Enhanced Analysis",
+        "description": "Vector search finds similar historical appraisals for context-aware risk assessment"
+    },
+    {
+        "icon": "🤖",
+        "title": "Agentic Orchestration",
+        "description": "LangChain agent adaptively processes evidence and determines readiness"
+    },
+    {
+        "icon": "📊",
+        "title": "Decision Readiness",
+        "description": "Confidence-aware routing with safe escalation paths for uncertain cases"
+    }
+]
+
+_FEATURE_CARD_TEMPLATE = '''
+<div class="autograb-feature-card">
+    <div class="autograb-feature-icon">{icon}</div>
+    <div class="autograb-feature-title">{title}</div>
+    <div class="autograb-feature-description">{description}</div>
+</div>
+'''
+
+_FEATURE_CARDS_HTML = [_FEATURE_CARD_TEMPLATE.format(**feature) for feature in _FEATURES]
+
 
 def render_header(current_page: str = None):
     """Render the header with navigation."""
-    header_html = '''
-    <div class="autograb-header">
-        <div class="autograb-header-container">
-            <div class="autograb-logo">Vehicle Appraisal Pre-Check</div>
-        </div>
-    </div>
-    '''
-    st.markdown(header_html, unsafe_allow_html=True)
+    # Static markup: st.html skips the markdown parser on every rerun
+    st.html(_HEADER_HTML)
     
     pages = {
         "Home": "home",
@@ -41,17 +87,7 @@ def render_header(current_page: str = None):
 
 def render_hero_section():
     """Render the hero section for the landing page."""
-    hero_html = '''
-    <div class="autograb-hero">
-        <h1>Automated Appraisal Pre-Processing</h1>
-        <p class="autograb-hero-subtitle">
-            Ensure sufficient evidence is collected <strong>before</strong> actual appraisal begins.
-            <br>AI-powered validation that saves time and prevents incomplete submissions.
-        </p>
-        <div class="autograb-hero-cta">
-        </div>
-    '''
-    st.markdown(hero_html, unsafe_allow_html=True)
+    st.markdown(_HERO_HTML, unsafe_allow_html=True)
     
     cta_cols = st.columns(2)
     with cta_cols[0]:
@@ -70,37 +106,7 @@ def render_hero_section():
 
 def render_feature_cards():
     """Render feature cards highlighting key capabilities."""
-    features = [
-        {
-            "icon": "📸",
-            "title": "AI Vision Extraction",
-            "description": "GPT-4 Vision analyzes photos to extract angles, odometer, VIN, and damage"
-        },
-        {
-            "icon": "🔍",
-            "title": "RAG-Enhanced Analysis",
-            "description": "Vector search finds similar historical appraisals for context-aware risk assessment"
-        },
-        {
-            "icon": "🤖",
-            "title": "Agentic Orchestration",
-            "description": "LangChain agent adaptively processes evidence and determines readiness"
-        },
-        {
-            "icon": "📊",
-            "title": "Decision Readiness",
-            "description": "Confidence-aware routing with safe escalation paths for uncertain cases"
-        }
-    ]
-    
-    cols = st.columns(4)
-    for i, feature in enumerate(features):
-        with cols[i]:
-            card_html = f'''
-            <div class="autograb-feature-card">
-                <div class="autograb-feature-icon">{feature["icon"]}</div>
-                <div class="autograb-feature-title">{feature["title"]}</div>
-                <div class="autograb-feature-description">{feature["description"]}</div>
-            </div>
-            '''
+    cols = st.columns(len(_FEATURE_CARDS_HTML))
+    for col, card_html in zip(cols, _FEATURE_CARDS_HTML):
+        with col:
             st.markdown(card_html, unsafe_allow_html=True)
@@ -0,0 +1,27 @@
+"""
+Formatting utilities for Vehicle Appraisal UI.
+Lives outside app.py so caches survive Streamlit reruns (app.py is re-executed each rerun).
+"""
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _format_timestamp_cached(ts: str, include_ms: bool) -> str:
+    """Parse and format one ISO timestamp; memoized since the same event times recur every rerun."""
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        if include_ms:
+            return dt.strftime("%H:%M:%S.%f")[:-3]
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return ts
+
+
+def format_timestamp(ts: str | None, include_ms: bool = False) -> str:
+    """Format ISO timestamp for display."""
+    if not ts:
+        return "N/A"
+    if not isinstance(ts, str):
+        return str(ts)
+    return _format_timestamp_cached(ts, include_ms)
@@ -2,9 +2,18 @@
 Styling utilities for Vehicle Appraisal UI.
 Handles CSS injection and styling helpers.
 """
+from functools import lru_cache
+
 import streamlit as st
 
 
+@st.cache_data(show_spinner=False)
+def _load_css(css_path: str, mtime: float) -> str:
+    """Read and wrap a stylesheet; keyed by mtime so edits are picked up without a restart."""
+    with open(css_path, 'r') as f:
+        return f'<style>{f.read()}</style>'
+
+
 def inject_custom_css(css_file_path: str = "assets/style.css"):
     """Inject custom CSS into Streamlit app."""
     try:
@@ -14,9 +23,8 @@ def inject_custom_css(css_file_path: str = "assets/style.css"):
         css_path = os.path.join(app_dir, css_file_path)
         
         if os.path.exists(css_path):
-            with open(css_path, 'r') as f:
-                css = f.read()
-            st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
+            # Still emitted every rerun: Streamlit drops elements a rerun doesn't re-render
+            st.markdown(_load_css(css_path, os.path.getmtime(css_path)), unsafe_allow_html=True)
         else:
             # Fallback: basic styles
             st.markdown("""
@@ -49,3 +57,16 @@ def render_card(html_content: str, title: str = None) -> str:
         {html_content}
     </div>
     '''
+
+
+@lru_cache(maxsize=101)
+def render_score_card(score: int) -> str:
+    """Render the readiness score card HTML; scores are 0-100 so every variant is cached."""
+    tier = "good" if score >= 80 else ("warn" if score >= 50 else "bad")
+    return f'''
+    <div class="autograb-readiness autograb-{tier}">
+        <div class="autograb-readiness-score">{score}</div>
+        <div class="autograb-readiness-max">/ 100</div>
+        <div class="autograb-readiness-label">Readiness Score</div>
+    </div>
+    '''
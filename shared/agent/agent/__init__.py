@@ -1 +1,28 @@
-"""Agent package for agentic execution mode."""
+"""
+Agent package for agentic execution mode.
+
+Puts the shared packages (for ``ledger.*``) and, unless it is already loaded, the
+backend (for ``app.*``) on sys.path once, before any submodule imports them.
+"""
+
+import sys
+from pathlib import Path
+
+_current_file = Path(__file__).resolve()
+_shared_path = _current_file.parent.parent.parent
+
+if str(_shared_path) not in sys.path:
+    sys.path.insert(0, str(_shared_path))
+
+if "app" not in sys.modules:
+    _backend_path = Path("/app")
+    if not (_backend_path / "app").exists():
+        # Try to find backend in parent directories
+        for _parent in _current_file.parents:
+            _candidate = _parent / "backend"
+            if _candidate.exists():
+                _backend_path = _candidate
+                break
+
+    if str(_backend_path) not in sys.path:
+        sys.path.insert(0, str(_backend_path))
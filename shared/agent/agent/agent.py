@@ -2,22 +2,7 @@
 
 from __future__ import annotations
 
-import sys
-from pathlib import Path
-
-# Add backend to path for imports
-current_file = Path(__file__).resolve()
-backend_path = Path("/app")
-if not (backend_path / "app").exists():
-    # Try to find backend in parent directories
-    for parent in current_file.parents:
-        candidate = parent / "backend"
-        if candidate.exists():
-            backend_path = candidate
-            break
-
-if str(backend_path) not in sys.path:
-    sys.path.insert(0, str(backend_path))
+from functools import lru_cache
 
 try:
     from langchain.agents import AgentExecutor, create_openai_tools_agent
@@ -39,62 +24,22 @@ except ImportError:
 from app.settings import get_settings
 from .tools import get_appraisal_tools
 
-
-def create_appraisal_agent(max_iterations: int = 50, max_execution_time: int = 300) -> AgentExecutor:
-    """
-    Create agent for appraisal processing using LangChain.
-    
-    Args:
-        max_iterations: Maximum number of agent iterations (default from settings)
-        max_execution_time: Maximum execution time in seconds (default from settings)
-    
-    Returns:
-        AgentExecutor configured for appraisal processing
-        
-    Raises:
-        ImportError: If LangChain dependencies are not installed
-    """
-    if not LANGCHAIN_AVAILABLE:
-        raise ImportError(
-            "LangChain is required for agentic mode. "
-            "Install with: pip install langchain langchain-openai"
-        )
-    
-    settings = get_settings()
-    
-    # Use settings values if not provided
-    if max_iterations == 50:
-        max_iterations = settings.agent_max_iterations
-    if max_execution_time == 300:
-        max_execution_time = settings.agent_execution_timeout_seconds
-    
-    # Initialize LLM with retry configuration
-    llm = ChatOpenAI(
-        model=settings.openai_text_model,
-        temperature=0,
-        api_key=settings.openai_api_key,
-        max_retries=3,  # Retry rate limit errors
-        request_timeout=settings.openai_request_timeout_seconds,
-    )
-    
-    # Get tools
-    tools = get_appraisal_tools()
-    
-    # Create prompt template
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are an AI assistant that processes vehicle appraisals.
+# Static so the prompt prefix is byte-identical across runs and hits the provider's prompt cache.
+# Template syntax: literal braces are doubled.
+_SYSTEM_PROMPT = """You are an AI assistant that processes vehicle appraisals.
 
 Your goal: Determine if an appraisal is ready for decision or needs more evidence.
 
 Available tools:
-- extract_vision_from_photo(photo_url, photo_id): Analyze a photo to extract vehicle information (angle, odometer, VIN, damage). Results are automatically stored.
+- extract_vision_from_photos_batch(photos): Analyze many photos in parallel. Pass every photo as a list of {{"photo_url": ..., "photo_id": ...}}. Results are automatically stored.
+- extract_vision_from_photo(photo_url, photo_id): Analyze a single photo to extract vehicle information (angle, odometer, VIN, damage). Results are automatically stored.
 - check_evidence_completeness(): Check what evidence is missing based on photos analyzed so far. No parameters needed.
 - retrieve_similar_appraisals(): Find similar historical appraisals to provide context for risk analysis. Call this BEFORE scan_for_risks() to enable pattern-based insights. No parameters needed.
 - scan_for_risks(): Identify risks and inconsistencies based on all data collected. If retrieve_similar_appraisals() was called first, this will include historical context. No parameters needed.
 - calculate_readiness_score(): Calculate final readiness score and determine decision status. No parameters needed.
 
 Process systematically:
-1. Extract information from ALL photos using extract_vision_from_photo (call once per photo with its URL and ID)
+1. Extract information from ALL photos by calling extract_vision_from_photos_batch ONCE with the full photo list (use extract_vision_from_photo only to retry a single photo)
 2. After processing ALL photos, check evidence completeness using check_evidence_completeness()
 3. IMPORTANT: Call retrieve_similar_appraisals() to find similar historical cases for context
 4. Scan for risks using scan_for_risks() (this will automatically use historical context from step 3)
@@ -115,13 +60,73 @@ When historical context is available from similar appraisals, use it to:
 - Validate expectations (e.g., "Mileage is normal for this vehicle age based on N similar cases")
 - Identify anomalies (e.g., "This damage pattern is unusual compared to historical data")
 
-Always explain your reasoning and cite evidence."""),
+Always explain your reasoning and cite evidence."""
+
+
+@lru_cache(maxsize=8)
+def _build_llm(model: str, request_timeout: int, api_key: str) -> ChatOpenAI:
+    """
+    Build the chat model once per configuration; later agents reuse it and its
+    underlying HTTP connection pool.
+    """
+    return ChatOpenAI(
+        model=model,
+        temperature=0,
+        api_key=api_key,
+        max_retries=3,  # Retry rate limit errors
+        request_timeout=request_timeout,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_appraisal_prompt() -> ChatPromptTemplate:
+    """Build the agent prompt template once; it is immutable and shared by every agent."""
+    return ChatPromptTemplate.from_messages([
+        ("system", _SYSTEM_PROMPT),
         ("human", "{input}"),
         MessagesPlaceholder(variable_name="agent_scratchpad"),
     ])
+
+
+def create_appraisal_agent(max_iterations: int = 50, max_execution_time: int = 300) -> AgentExecutor:
+    """
+    Create agent for appraisal processing using LangChain.
+    
+    Args:
+        max_iterations: Maximum number of agent iterations (default from settings)
+        max_execution_time: Maximum execution time in seconds (default from settings)
+    
+    Returns:
+        AgentExecutor configured for appraisal processing
+        
+    Raises:
+        ImportError: If LangChain dependencies are not installed
+    """
+    if not LANGCHAIN_AVAILABLE:
+        raise ImportError(
+            "LangChain is required for agentic mode. "
+            "Install with: pip install langchain langchain-openai"
+        )
+    
+    settings = get_settings()
+    
+    # Use settings values if not provided
+    if max_iterations == 50:
+        max_iterations = settings.agent_max_iterations
+    if max_execution_time == 300:
+        max_execution_time = settings.agent_execution_timeout_seconds
+    
+    llm = _build_llm(
+        settings.openai_text_model,
+        settings.openai_request_timeout_seconds,
+        settings.openai_api_key,
+    )
+    
+    # Get tools
+    tools = get_appraisal_tools()
     
     # Create agent
-    agent = create_openai_tools_agent(llm, tools, prompt)
+    agent = create_openai_tools_agent(llm, tools, _get_appraisal_prompt())
     
     # Create executor with safeguards
     executor = AgentExecutor(
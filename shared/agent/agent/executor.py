@@ -2,31 +2,22 @@
 
 from __future__ import annotations
 
-import sys
+import asyncio
+import functools
+import json
 from datetime import datetime
-from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-# Add shared packages to path
-current_file = Path(__file__).resolve()
-shared_path = current_file.parent.parent.parent
-
-# Add backend to path
-backend_path = Path("/app")
-if not (backend_path / "app").exists():
-    for parent in current_file.parents:
-        candidate = parent / "backend"
-        if candidate.exists():
-            backend_path = candidate
-            break
-
-if str(backend_path) not in sys.path:
-    sys.path.insert(0, str(backend_path))
+from supabase import Client
 
-if str(shared_path) not in sys.path:
-    sys.path.insert(0, str(shared_path))
+try:
+    import orjson
 
-from supabase import Client
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
 
 try:
     from langchain.agents import AgentExecutor
@@ -36,8 +27,38 @@ except ImportError:
     class AgentExecutor:
         pass
 
-from ledger.ledger.writer import append_ledger_event
-from .tools import set_agent_context, get_agent_context
+from app.policy import determine_decision_status, route_action
+from app.scoring import calculate_total_score
+from ledger.ledger.writer import build_ledger_event, submit_ledger_events
+from .tools import collect_cached_vision, get_agent_context, get_angle_coverage, set_agent_context
+
+_STATIC_TASK_INSTRUCTIONS = """Your task:
+1. Extract information from ALL photos using extract_vision_from_photos_batch tool
+   - Call extract_vision_from_photos_batch ONCE with photos=[{"photo_url": <url>, "photo_id": <id>}, ...] covering EVERY photo listed below
+   - Use the exact URLs and IDs provided
+2. After extracting ALL photos, check evidence completeness
+3. IMPORTANT: Call retrieve_similar_appraisals() to find similar historical cases
+4. Scan for risks and inconsistencies (this will use historical context from step 3)
+5. Calculate readiness score
+6. Provide final recommendation
+
+IMPORTANT: You MUST use the exact photo_url and photo_id values provided below. Do not make up placeholder URLs.
+"""
+
+
+def _safe_truncate(obj: Any, limit: int) -> str:
+    """
+    Text for a ledger field, capped at limit characters.
+    Strings are sliced directly; dicts and lists (tool observations) are rendered as
+    JSON rather than repr, so the untruncated ones stay parseable.
+    """
+    if isinstance(obj, str):
+        text = obj
+    elif isinstance(obj, (dict, list)):
+        text = _json_dumps(obj)
+    else:
+        text = str(obj)
+    return text[:limit]
 
 
 def execute_agent_with_ledger(
@@ -48,66 +69,106 @@ def execute_agent_with_ledger(
     initial_context: dict[str, Any],
 ) -> dict[str, Any]:
     """
-    Execute agent and log each step to ledger.
+    Execute agent and log each step to ledger (synchronous version).
+    Calls agent.invoke directly rather than driving the async version on a fresh
+    event loop, since the cached chat model's async client is bound to the loop
+    that first used it.
+    """
+    if not LANGCHAIN_AVAILABLE:
+        raise ImportError("LangChain is required for agentic mode")
+    
+    metadata, notes, artifacts = _unpack_initial_context(initial_context)
+    set_agent_context(metadata=metadata, notes=notes, cached_vision=collect_cached_vision(artifacts))
+    events, ledger_event = _start_ledger_events(appraisal_id, pipeline_run_id, initial_context)
+    agent_input = _build_agent_input(appraisal_id, metadata, notes, artifacts)
+    
+    try:
+        result = agent.invoke({
+            "input": agent_input,
+        })
+        final_output, intermediate_steps, tools_used = _log_agent_result(events, ledger_event, result)
+        return _build_run_results(final_output, intermediate_steps, tools_used)
+    
+    except Exception as e:
+        _log_agent_error(events, ledger_event, e)
+        raise
+    
+    finally:
+        submit_ledger_events(supabase, events)
+
+
+async def run_appraisals_batch(runs: list[dict[str, Any]]) -> list[dict[str, Any] | BaseException]:
+    """
+    Execute several agent runs concurrently on the current event loop.
     
     Args:
-        agent: AgentExecutor instance
-        supabase: Supabase client
-        appraisal_id: UUID of the appraisal
-        pipeline_run_id: UUID of the pipeline run
-        initial_context: Initial context dictionary
+        runs: Keyword arguments for execute_agent_with_ledger_async, one dict per run
         
     Returns:
-        Dictionary with final results matching sequential pipeline format
+        One result per run, in order; a run that raised contributes its exception
+        instead of cancelling the others
     """
-    if not LANGCHAIN_AVAILABLE:
-        raise ImportError("LangChain is required for agentic mode")
-    
-    # Initialize shared context for tools
+    return await asyncio.gather(
+        *(execute_agent_with_ledger_async(**run) for run in runs),
+        return_exceptions=True,
+    )
+
+
+def _unpack_initial_context(initial_context: dict[str, Any]) -> tuple[dict[str, Any], str, list[dict[str, Any]]]:
+    """(metadata, notes, artifacts) for the appraisal in the initial context."""
     appraisal = initial_context.get("appraisal", {})
-    metadata = appraisal.get("metadata_json", {})
-    notes = appraisal.get("notes_raw", "")
-    set_agent_context(metadata=metadata, notes=notes)
-    
-    # Log agent start
-    append_ledger_event(
-        supabase=supabase,
+    return appraisal.get("metadata_json", {}), appraisal.get("notes_raw", ""), initial_context.get("artifacts", [])
+
+
+def _start_ledger_events(
+    appraisal_id: str,
+    pipeline_run_id: str,
+    initial_context: dict[str, Any],
+) -> tuple[list[dict[str, Any]], Callable[..., dict[str, Any]]]:
+    """
+    Event buffer for one run, seeded with the agent_start event, and the event builder.
+    Events are buffered and written in one insert when the run ends.
+    """
+    events: list[dict[str, Any]] = []
+    ledger_event = functools.partial(
+        build_ledger_event,
         appraisal_id=appraisal_id,
         pipeline_run_id=pipeline_run_id,
-        node_name="agent_start",
         schema_version="v1",
+        confidence_summary=None,
+    )
+    
+    # Log agent start
+    events.append(ledger_event(
+        node_name="agent_start",
         input_refs={"context_keys": list(initial_context.keys())},
         output={
             "mode": "agentic",
             "initial_context_keys": list(initial_context.keys()),
             "artifact_count": len(initial_context.get("artifacts", [])),
         },
-        confidence_summary=None,
         status="ok",
-    )
-    
-    # Build input for agent
-    appraisal = initial_context.get("appraisal", {})
-    metadata = appraisal.get("metadata_json", {})
-    notes = appraisal.get("notes_raw", "")
-    artifacts = initial_context.get("artifacts", [])
-    
-    # Build photo list with URLs and IDs for the agent
-    photo_list = []
-    for artifact in artifacts:
-        if artifact.get("signed_url"):
-            photo_list.append({
-                "id": artifact.get("id"),
-                "url": artifact.get("signed_url"),
-            })
-    
-    # Format photo information for agent
-    photos_text = "\n".join([
-        f"- Photo ID: {photo['id']}, URL: {photo['url']}"
-        for photo in photo_list
-    ])
+    ))
+    return events, ledger_event
+
+
+def _build_agent_input(
+    appraisal_id: str,
+    metadata: dict[str, Any],
+    notes: str,
+    artifacts: list[dict[str, Any]],
+) -> str:
+    """Agent prompt: static instructions first, per-appraisal data last, so the cacheable prefix is as long as possible."""
+    # One line per photo that has a signed URL, in a single pass
+    photo_lines = [
+        f"- Photo ID: {artifact.get('id')}, URL: {artifact['signed_url']}"
+        for artifact in artifacts
+        if artifact.get("signed_url")
+    ]
+    photos_text = "\n".join(photo_lines)
     
-    agent_input = f"""Process appraisal {appraisal_id}.
+    return _STATIC_TASK_INSTRUCTIONS + f"""
+Process appraisal {appraisal_id}.
 
 Vehicle Information:
 - Year: {metadata.get('year', 'N/A')}
@@ -116,154 +177,193 @@ Vehicle Information:
 - Mileage: {metadata.get('mileage', 'N/A')}
 - Notes: {notes[:500] if notes else 'None'}
 
-Available Photos ({len(photo_list)} total):
-{photos_text if photos_text else "No photos available"}
+Available Photos ({len(photo_lines)} total):
+{photos_text if photos_text else "No photos available"}"""
 
-Your task:
-1. Extract information from ALL photos using extract_vision_from_photo tool
-   - Call extract_vision_from_photo(photo_url=<url>, photo_id=<id>) for EACH photo above
-   - Use the exact URLs and IDs provided
-2. After extracting ALL photos, check evidence completeness
-3. IMPORTANT: Call retrieve_similar_appraisals() to find similar historical cases
-4. Scan for risks and inconsistencies (this will use historical context from step 3)
-5. Calculate readiness score
-6. Provide final recommendation
 
-IMPORTANT: You MUST use the exact photo_url and photo_id values provided above. Do not make up placeholder URLs."""
+def _log_agent_result(
+    events: list[dict[str, Any]],
+    ledger_event: Callable[..., dict[str, Any]],
+    result: dict[str, Any],
+) -> tuple[Any, list[Any], list[str]]:
+    """Record a ledger event per tool call plus agent_complete; returns (final_output, intermediate_steps, tools_used)."""
+    # Extract final output
+    final_output = result.get("output", "")
+    intermediate_steps = result.get("intermediate_steps", [])
+    # Tool names are read once and shared by the ledger events and the execution summary
+    tools_used = [getattr(action, "tool", "unknown_tool") for action, _ in intermediate_steps]
     
-    try:
-        # Execute agent
-        result = agent.invoke({
-            "input": agent_input,
-        })
-        
-        # Extract final output
-        final_output = result.get("output", "")
-        intermediate_steps = result.get("intermediate_steps", [])
-        
-        # Log each tool call as a ledger event
-        for step_idx, (action, observation) in enumerate(intermediate_steps):
-            tool_name = action.tool if hasattr(action, "tool") else "unknown_tool"
-            tool_input = action.tool_input if hasattr(action, "tool_input") else {}
-            
-            append_ledger_event(
-                supabase=supabase,
-                appraisal_id=appraisal_id,
-                pipeline_run_id=pipeline_run_id,
-                node_name=f"agent_tool_{tool_name}",
-                schema_version="v1",
-                input_refs={"tool": tool_name, "step": step_idx, "input": tool_input},
-                output={
-                    "tool": tool_name,
-                    "observation": str(observation)[:1000],  # Truncate long observations
-                    "step": step_idx,
-                },
-                confidence_summary=None,
-                status="ok",
-            )
+    # Log each tool call as a ledger event
+    for step_idx, (tool_name, (action, observation)) in enumerate(zip(tools_used, intermediate_steps)):
+        tool_input = getattr(action, "tool_input", {})
         
-        # Log agent completion
-        append_ledger_event(
-            supabase=supabase,
-            appraisal_id=appraisal_id,
-            pipeline_run_id=pipeline_run_id,
-            node_name="agent_complete",
-            schema_version="v1",
-            input_refs={},
+        events.append(ledger_event(
+            node_name=f"agent_tool_{tool_name}",
+            input_refs={"tool": tool_name, "step": step_idx, "input": tool_input},
             output={
-                "final_output": final_output[:2000],  # Truncate if too long
-                "steps_count": len(intermediate_steps),
-                "mode": "agentic",
+                "tool": tool_name,
+                "observation": _safe_truncate(observation, 1000),
+                "step": step_idx,
             },
-            confidence_summary=None,
             status="ok",
-        )
-        
-        # Get results from shared context (where tools stored them)
-        context_results = get_agent_context()
+        ))
+    
+    # Log agent completion
+    events.append(ledger_event(
+        node_name="agent_complete",
+        input_refs={},
+        output={
+            "final_output": _safe_truncate(final_output, 2000),
+            "steps_count": len(intermediate_steps),
+            "mode": "agentic",
+        },
+        status="ok",
+    ))
+    return final_output, intermediate_steps, tools_used
+
+
+def _log_agent_error(
+    events: list[dict[str, Any]],
+    ledger_event: Callable[..., dict[str, Any]],
+    error: Exception,
+) -> None:
+    """Record the agent_error event for a failed run."""
+    events.append(ledger_event(
+        node_name="agent_error",
+        input_refs={},
+        output={"error": str(error)},
+        status="fail",
+        error=str(error),
+    ))
+
+
+def _build_run_results(
+    final_output: Any,
+    intermediate_steps: list[Any],
+    tools_used: list[str],
+) -> dict[str, Any]:
+    """Assemble the run's structured results from the agent context the tools filled in."""
+    # Get results from shared context (where tools stored them)
+    context_results = get_agent_context()
+    
+    # Extract structured results
+    vision_outputs = context_results.get("vision_outputs", [])
+    risk_and_consistency = context_results.get("risk_and_consistency", {})
+    
+    # Build evidence completeness from vision outputs
+    evidence_completeness = {}
+    if vision_outputs:
+        angle_result = get_angle_coverage()
+        evidence_completeness = {
+            "missing_angles": angle_result.get("missing_angles", []),
+            "covered_angles": angle_result.get("covered_angles", []),
+            "photo_count": len(vision_outputs),
+            "is_complete": not context_results["missing_angles_set"],
+        }
+    
+    # Build decision readiness, reusing calculate_readiness_score's result unless
+    # more photos or a new risk scan came in after the agent called it
+    decision_readiness = {}
+    if (
+        context_results.get("decision_readiness")
+        and context_results.get("decision_inputs")
+        == (len(vision_outputs), context_results.get("risk_version", 0))
+    ):
+        decision_readiness = context_results["decision_readiness"]
+    elif vision_outputs:
+        scoring_result = calculate_total_score({
+            "vision_outputs": vision_outputs,
+            "notes": context_results.get("notes", ""),
+            "normalized_metadata": context_results.get("metadata", {}),
+            "angle_coverage": angle_result,
+        })
         
-        # Extract structured results
-        vision_outputs = context_results.get("vision_outputs", [])
-        risk_and_consistency = context_results.get("risk_and_consistency", {})
+        total_score = scoring_result["total_score"]
+        risk_flags = risk_and_consistency.get("flags", [])
+        decision = determine_decision_status(total_score, risk_flags, scoring_result)
+        next_action = route_action(decision["status"])
         
-        # Build evidence completeness from vision outputs
-        evidence_completeness = {}
-        if vision_outputs:
-            from app.scoring import score_angle_coverage
-            metadata = context_results.get("metadata", {})
-            angle_result = score_angle_coverage(vision_outputs, metadata)
-            evidence_completeness = {
-                "missing_angles": angle_result.get("missing_angles", []),
-                "covered_angles": angle_result.get("covered_angles", []),
-                "photo_count": len(vision_outputs),
-                "is_complete": len(angle_result.get("missing_angles", [])) == 0,
-            }
+        decision_readiness = {
+            "score": total_score,
+            "status": decision["status"],
+            "reasons": decision["reasons"],
+            "breakdown": scoring_result["breakdown"],
+            "next_action": next_action,
+        }
+    
+    # Return structured result matching sequential pipeline format
+    return {
+        "agent_output": final_output,
+        "intermediate_steps_count": len(intermediate_steps),
+        "mode": "agentic",
+        "execution_summary": {
+            "tools_used": tools_used,
+        },
+        # Include actual pipeline results
+        "ingest_normalize": {
+            "normalized_metadata": context_results.get("metadata", {}),
+            "notes": context_results.get("notes", ""),
+        },
+        "vision_per_image": {
+            "vision_outputs": vision_outputs,
+        },
+        "evidence_completeness": evidence_completeness,
+        "risk_and_consistency": risk_and_consistency,
+        "decision_readiness": decision_readiness,
+        "action_router": decision_readiness.get("next_action", {}) if decision_readiness else {},
+        "ledger_finalization": {
+            "status": "completed",
+            "mode": "agentic",
+        },
+    }
+
+
+async def execute_agent_with_ledger_async(
+    agent: AgentExecutor,
+    supabase: Client,
+    appraisal_id: str,
+    pipeline_run_id: str,
+    initial_context: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Execute agent and log each step to ledger (async version).
+    LLM calls are awaited via agent.ainvoke, so other runs and requests on the
+    same event loop make progress while this one waits on the network.
+    
+    Args:
+        agent: AgentExecutor instance
+        supabase: Supabase client
+        appraisal_id: UUID of the appraisal
+        pipeline_run_id: UUID of the pipeline run
+        initial_context: Initial context dictionary
         
-        # Build decision readiness
-        decision_readiness = {}
-        if vision_outputs:
-            from app.scoring import calculate_total_score
-            from app.policy import determine_decision_status, route_action
-            
-            scoring_result = calculate_total_score({
-                "vision_outputs": vision_outputs,
-                "notes": context_results.get("notes", ""),
-                "normalized_metadata": context_results.get("metadata", {}),
-            })
-            
-            total_score = scoring_result["total_score"]
-            risk_flags = risk_and_consistency.get("flags", [])
-            decision = determine_decision_status(total_score, risk_flags, scoring_result)
-            next_action = route_action(decision["status"])
-            
-            decision_readiness = {
-                "score": total_score,
-                "status": decision["status"],
-                "reasons": decision["reasons"],
-                "breakdown": scoring_result["breakdown"],
-                "next_action": next_action,
-            }
+    Returns:
+        Dictionary with final results matching sequential pipeline format
+    """
+    if not LANGCHAIN_AVAILABLE:
+        raise ImportError("LangChain is required for agentic mode")
+    
+    metadata, notes, artifacts = _unpack_initial_context(initial_context)
+    # The vision prefetch may query Supabase, so it runs off the event loop
+    cached_vision = await asyncio.to_thread(collect_cached_vision, artifacts)
+    set_agent_context(metadata=metadata, notes=notes, cached_vision=cached_vision)
+    events, ledger_event = _start_ledger_events(appraisal_id, pipeline_run_id, initial_context)
+    agent_input = _build_agent_input(appraisal_id, metadata, notes, artifacts)
+    
+    try:
+        # Execute agent
+        result = await agent.ainvoke({
+            "input": agent_input,
+        })
+        final_output, intermediate_steps, tools_used = _log_agent_result(events, ledger_event, result)
         
-        # Return structured result matching sequential pipeline format
-        return {
-            "agent_output": final_output,
-            "intermediate_steps_count": len(intermediate_steps),
-            "mode": "agentic",
-            "execution_summary": {
-                "tools_used": [step[0].tool if hasattr(step[0], "tool") else "unknown" 
-                              for step in intermediate_steps],
-            },
-            # Include actual pipeline results
-            "ingest_normalize": {
-                "normalized_metadata": context_results.get("metadata", {}),
-                "notes": context_results.get("notes", ""),
-            },
-            "vision_per_image": {
-                "vision_outputs": vision_outputs,
-            },
-            "evidence_completeness": evidence_completeness,
-            "risk_and_consistency": risk_and_consistency,
-            "decision_readiness": decision_readiness,
-            "action_router": decision_readiness.get("next_action", {}) if decision_readiness else {},
-            "ledger_finalization": {
-                "status": "completed",
-                "mode": "agentic",
-            },
-        }
+        # Scoring and coverage are synchronous; run them off the event loop. to_thread
+        # copies the current context, so the helper sees this run's agent context.
+        return await asyncio.to_thread(_build_run_results, final_output, intermediate_steps, tools_used)
         
     except Exception as e:
-        # Log agent error
-        append_ledger_event(
-            supabase=supabase,
-            appraisal_id=appraisal_id,
-            pipeline_run_id=pipeline_run_id,
-            node_name="agent_error",
-            schema_version="v1",
-            input_refs={},
-            output={"error": str(e)},
-            confidence_summary=None,
-            status="fail",
-            error=str(e),
-        )
-        
+        _log_agent_error(events, ledger_event, e)
         raise
+    
+    finally:
+        submit_ledger_events(supabase, events)
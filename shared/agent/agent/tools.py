@@ -3,23 +3,11 @@
 from __future__ import annotations
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any
 
-# Add backend to path for imports
-current_file = Path(__file__).resolve()
-backend_path = Path("/app")
-if not (backend_path / "app").exists():
-    # Try to find backend in parent directories
-    for parent in current_file.parents:
-        candidate = parent / "backend"
-        if candidate.exists():
-            backend_path = candidate
-            break
-
-if str(backend_path) not in sys.path:
-    sys.path.insert(0, str(backend_path))
-
 try:
     from langchain_core.tools import tool
 except ImportError:
@@ -28,33 +16,116 @@ except ImportError:
         """Dummy decorator if langchain not available"""
         return func
 
-# These will be imported when backend modules are created
-# from app.vision import extract_from_photo
-# from app.risk import run_risk_scan
-# from app.scoring import calculate_total_score
-# from app.policy import determine_decision_status, route_action
+# Imported once here rather than inside each tool call
+from app.policy import determine_decision_status, route_action
+from app.risk import run_risk_scan
+from app.scoring import calculate_total_score, score_angle_coverage
+from app.supabase_client import get_supabase_client
+from app.vision import extract_from_photo
 
-# Shared context for agent execution
-_agent_context: dict[str, Any] = {
-    "vision_outputs": [],
-    "metadata": {},
-    "notes": "",
-}
+# Per-run context shared by the tools. A ContextVar rather than a module global,
+# so concurrent runs (threads or asyncio tasks) each see their own.
+_agent_context_var: ContextVar[dict[str, Any]] = ContextVar("agent_context")
 
 
-def set_agent_context(metadata: dict[str, Any], notes: str) -> None:
-    """Initialize agent context for a new run."""
-    global _agent_context
-    _agent_context = {
+def _new_agent_context(metadata: dict[str, Any], notes: str, cached_vision: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Fresh context for one agent run."""
+    return {
         "vision_outputs": [],
+        # Aggregates over vision_outputs, updated as outputs are recorded so no tool rescans them
+        "derived": {"odometer_present": False, "vin_present": False},
         "metadata": metadata,
         "notes": notes,
+        "cached_vision": cached_vision,
+        # Results already recorded this run, so a repeated photo_id is neither re-extracted nor double-counted
+        "vision_by_id": {},
+        # Bumped each time scan_for_risks stores a result, so consumers can tell a new scan happened
+        "risk_version": 0,
     }
 
 
+def collect_cached_vision(artifacts: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """
+    Reusable vision output for a run's artifacts, keyed by artifact ID.
+    
+    Taken from the artifact rows themselves when they carry vision_output_json,
+    otherwise fetched with a single (blocking) query.
+    """
+    if all("vision_output_json" in artifact for artifact in artifacts):
+        return {
+            artifact["id"]: artifact["vision_output_json"]
+            for artifact in artifacts
+            if _is_usable_vision_data(artifact.get("vision_output_json"))
+        }
+    return _fetch_cached_vision_data([artifact["id"] for artifact in artifacts if artifact.get("id")])
+
+
+def set_agent_context(
+    metadata: dict[str, Any],
+    notes: str,
+    artifacts: list[dict[str, Any]] | None = None,
+    cached_vision: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    """
+    Initialize agent context for a new run in the current execution context.
+    
+    Reusable vision output is collected up front (see collect_cached_vision) so
+    vision tools never look it up per photo. Async callers should collect it off
+    the event loop and pass it as cached_vision.
+    """
+    if cached_vision is None:
+        cached_vision = collect_cached_vision(artifacts or [])
+    _agent_context_var.set(_new_agent_context(metadata, notes, cached_vision))
+
+
 def get_agent_context() -> dict[str, Any]:
-    """Get current agent context."""
-    return _agent_context
+    """
+    Get the agent context for the current execution context.
+    
+    Raises:
+        RuntimeError: If set_agent_context has not been called in this context
+    """
+    try:
+        return _agent_context_var.get()
+    except LookupError as e:
+        raise RuntimeError("Agent context is not set; call set_agent_context before running tools") from e
+
+
+def get_angle_coverage() -> dict[str, Any]:
+    """
+    Angle coverage for the vision outputs collected so far, computed once per
+    set of outputs and shared by the evidence, scoring and executor steps.
+    Also keeps the missing angles as a frozenset for membership checks.
+    """
+    ctx = get_agent_context()
+    vision_outputs = ctx.get("vision_outputs", [])
+    cached = ctx.get("angle_coverage")
+    if cached is not None and ctx.get("angle_coverage_count") == len(vision_outputs):
+        return cached
+    
+    angle_result = score_angle_coverage(vision_outputs, ctx.get("metadata", {}))
+    ctx["angle_coverage"] = angle_result
+    ctx["angle_coverage_count"] = len(vision_outputs)
+    ctx["missing_angles_set"] = frozenset(angle_result.get("missing_angles", []))
+    return angle_result
+
+
+def _record_vision_outputs(photo_ids: list[str], results: list[dict[str, Any]]) -> None:
+    """
+    Append vision results to agent context, updating the derived aggregates in the same pass.
+    Results that did not fail are remembered by photo ID for the rest of the run.
+    """
+    ctx = get_agent_context()
+    ctx["vision_outputs"].extend(results)
+    derived = ctx["derived"]
+    for photo_id, result in zip(photo_ids, results):
+        if not result.get("error"):
+            ctx["vision_by_id"][photo_id] = result
+        extraction = result.get("extraction", {})
+        if extraction.get("odometer", {}).get("value"):
+            derived["odometer_present"] = True
+        if extraction.get("vin", {}).get("text"):
+            derived["vin_present"] = True
 
 
 @tool
@@ -75,50 +146,113 @@ def extract_vision_from_photo(photo_url: str, photo_id: str) -> dict[str, Any]:
         - vin: VIN if found
         - damage: List of damage items detected
     """
+    # Already extracted earlier in this run
+    previous = get_agent_context()["vision_by_id"].get(photo_id)
+    if previous is not None:
+        return previous
+    
     try:
-        from app.vision import extract_from_photo
-        
         # Check for cached vision data
         cached_result = _try_get_cached_vision_data(photo_id)
-        if cached_result and not cached_result.get("error"):
-            _agent_context["vision_outputs"].append(cached_result)
+        if cached_result:
+            _record_vision_outputs([photo_id], [cached_result])
             return cached_result
         
         # Extract fresh
         result = extract_from_photo(photo_url, photo_id)
-        _agent_context["vision_outputs"].append(result)
+        _record_vision_outputs([photo_id], [result])
         return result
     except Exception as e:
-        error_result = {
-            "photo_id": photo_id,
-            "error": str(e),
-            "extraction": {
-                "photo_angle": {"angle": "unknown", "confidence": 0.0},
-                "odometer": {"value": None, "unit": None, "confidence": 0.0},
-                "vin": {"text": None, "confidence": 0.0},
-                "damage": [],
-            }
-        }
-        _agent_context["vision_outputs"].append(error_result)
+        error_result = _vision_error_result(photo_id, e)
+        _record_vision_outputs([photo_id], [error_result])
         return error_result
 
 
-def _try_get_cached_vision_data(artifact_id: str) -> dict[str, Any] | None:
-    """Try to retrieve cached vision data from the artifact's vision_output_json field."""
-    try:
-        from app.supabase_client import get_supabase_client
-        
-        supabase = get_supabase_client()
-        result = supabase.table("artifacts").select("vision_output_json").eq("id", artifact_id).single().execute()
+# Vision calls are network-bound, so threads overlap them despite the GIL
+_VISION_MAX_WORKERS = 8
+
+
+@tool
+def extract_vision_from_photos_batch(photos: list[dict[str, str]]) -> list[dict[str, Any]]:
+    """
+    Extract vehicle information from several photos at once, in parallel.
+    Prefer this over calling extract_vision_from_photo once per photo.
+    Uses cached vision data where available; results are stored in agent context.
+    
+    Args:
+        photos: List of {"photo_url": ..., "photo_id": ...} entries, one per photo
         
-        if result.data and result.data.get("vision_output_json"):
-            vision_data = result.data["vision_output_json"]
-            if vision_data.get("extraction") and not vision_data.get("validation_error"):
-                return vision_data
+    Returns:
+        List of extraction results in the same order as photos
+    """
+    previous = get_agent_context()["vision_by_id"]
+    photo_urls = {photo.get("photo_id"): photo.get("photo_url") for photo in photos}
+    # Photos not yet seen this run, once each even if listed twice
+    new_ids = [photo_id for photo_id in photo_urls if photo_id not in previous]
+    
+    fetched = {photo_id: _try_get_cached_vision_data(photo_id) for photo_id in new_ids}
+    pending = [photo_id for photo_id, result in fetched.items() if result is None]
+    if pending:
+        def extract(photo_id: str) -> dict[str, Any]:
+            try:
+                return extract_from_photo(photo_urls[photo_id], photo_id)
+            except Exception as e:
+                return _vision_error_result(photo_id, e)
         
-        return None
+        with ThreadPoolExecutor(max_workers=min(len(pending), _VISION_MAX_WORKERS)) as pool:
+            fetched.update(zip(pending, pool.map(extract, pending)))
+    
+    # Appended here, in input order, rather than from the worker threads
+    _record_vision_outputs(new_ids, [fetched[photo_id] for photo_id in new_ids])
+    return [
+        fetched[photo.get("photo_id")] if photo.get("photo_id") in fetched else previous[photo.get("photo_id")]
+        for photo in photos
+    ]
+
+
+def _vision_error_result(photo_id: str, error: Exception) -> dict[str, Any]:
+    """Placeholder vision output for a photo whose extraction raised."""
+    return {
+        "photo_id": photo_id,
+        "error": str(error),
+        "extraction": {
+            "photo_angle": {"angle": "unknown", "confidence": 0.0},
+            "odometer": {"value": None, "unit": None, "confidence": 0.0},
+            "vin": {"text": None, "confidence": 0.0},
+            "damage": [],
+        }
+    }
+
+
+def _is_usable_vision_data(vision_data: dict[str, Any] | None) -> bool:
+    """Whether stored vision output can be reused instead of calling the vision model."""
+    return bool(
+        vision_data
+        and vision_data.get("extraction")
+        and not vision_data.get("validation_error")
+        and not vision_data.get("error")
+    )
+
+
+def _fetch_cached_vision_data(artifact_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Fetch reusable vision data for many artifacts in one query, keyed by artifact ID."""
+    if not artifact_ids:
+        return {}
+    try:
+        supabase = get_supabase_client()
+        result = supabase.table("artifacts").select("id, vision_output_json").in_("id", artifact_ids).execute()
+        return {
+            row["id"]: row["vision_output_json"]
+            for row in result.data or []
+            if _is_usable_vision_data(row.get("vision_output_json"))
+        }
     except Exception:
-        return None
+        return {}
+
+
+def _try_get_cached_vision_data(artifact_id: str) -> dict[str, Any] | None:
+    """Look up vision data prefetched by set_agent_context for an artifact."""
+    return get_agent_context().get("cached_vision", {}).get(artifact_id)
 
 
 @tool
@@ -136,25 +270,14 @@ def check_evidence_completeness() -> dict[str, Any]:
         - odometer_status: Status of odometer evidence
         - vin_status: Status of VIN evidence
     """
+    ctx = get_agent_context()
     try:
-        from app.scoring import score_angle_coverage
-        
-        vision_outputs = _agent_context.get("vision_outputs", [])
-        metadata = _agent_context.get("metadata", {})
-        
-        # Calculate angle coverage
-        angle_result = score_angle_coverage(vision_outputs, metadata)
+        vision_outputs = ctx.get("vision_outputs", [])
+        angle_result = get_angle_coverage()
         
-        # Check odometer and VIN from vision outputs
-        odometer_found = False
-        vin_found = False
-        
-        for output in vision_outputs:
-            extraction = output.get("extraction", {})
-            if extraction.get("odometer", {}).get("value"):
-                odometer_found = True
-            if extraction.get("vin", {}).get("text"):
-                vin_found = True
+        # Odometer and VIN presence are maintained as outputs are recorded
+        odometer_found = ctx["derived"]["odometer_present"]
+        vin_found = ctx["derived"]["vin_present"]
         
         return {
             "missing_angles": angle_result.get("missing_angles", []),
@@ -163,7 +286,7 @@ def check_evidence_completeness() -> dict[str, Any]:
             "completeness_score": angle_result.get("score", 0),
             "odometer_status": "found" if odometer_found else "missing",
             "vin_status": "found" if vin_found else "missing",
-            "is_complete": len(angle_result.get("missing_angles", [])) == 0,
+            "is_complete": not ctx["missing_angles_set"],
             "photos_analyzed": len(vision_outputs),
         }
     except Exception as e:
@@ -197,6 +320,8 @@ def retrieve_similar_appraisals() -> dict[str, Any]:
     if not os.getenv("ENABLE_RAG", "false").lower() == "true":
         return {"similar_count": 0, "similar_cases": [], "rag_enabled": False}
     
+    ctx = get_agent_context()
+    
     try:
         # Import RAG utilities
         current_file = Path(__file__).resolve()
@@ -211,11 +336,11 @@ def retrieve_similar_appraisals() -> dict[str, Any]:
         # Build query from current context
         context = {
             "ingest_normalize": {
-                "normalized_metadata": _agent_context.get("metadata", {}),
-                "notes": _agent_context.get("notes", ""),
+                "normalized_metadata": ctx.get("metadata", {}),
+                "notes": ctx.get("notes", ""),
             },
             "vision_per_image": {
-                "vision_outputs": _agent_context.get("vision_outputs", [])
+                "vision_outputs": ctx.get("vision_outputs", [])
             }
         }
         
@@ -249,7 +374,7 @@ def retrieve_similar_appraisals() -> dict[str, Any]:
             
             formatted_cases.append(formatted_entry)
         
-        _agent_context["similar_appraisals"] = formatted_cases
+        ctx["similar_appraisals"] = formatted_cases
         
         return {
             "similar_count": len(similar),
@@ -282,17 +407,16 @@ def scan_for_risks() -> dict[str, Any]:
         - unknowns: List of unknown factors
         - used_historical_context: Whether similar appraisals were used
     """
+    ctx = get_agent_context()
     try:
-        from app.risk import run_risk_scan
-        
         context = {
-            "normalized_metadata": _agent_context.get("metadata", {}),
-            "notes": _agent_context.get("notes", ""),
-            "vision_outputs": _agent_context.get("vision_outputs", []),
+            "normalized_metadata": ctx.get("metadata", {}),
+            "notes": ctx.get("notes", ""),
+            "vision_outputs": ctx.get("vision_outputs", []),
         }
         
         # Add similar appraisals if available
-        similar_cases = _agent_context.get("similar_appraisals", [])
+        similar_cases = ctx.get("similar_appraisals", [])
         if similar_cases:
             context["similar_historical_appraisals"] = {
                 "count": len(similar_cases),
@@ -302,7 +426,8 @@ def scan_for_risks() -> dict[str, Any]:
         
         result = run_risk_scan(context)
         result["used_historical_context"] = len(similar_cases) > 0
-        _agent_context["risk_and_consistency"] = result
+        ctx["risk_and_consistency"] = result
+        ctx["risk_version"] = ctx.get("risk_version", 0) + 1
         return result
     except Exception as e:
         error_result = {
@@ -312,7 +437,8 @@ def scan_for_risks() -> dict[str, Any]:
             "unknowns": [],
             "used_historical_context": False,
         }
-        _agent_context["risk_and_consistency"] = error_result
+        ctx["risk_and_consistency"] = error_result
+        ctx["risk_version"] = ctx.get("risk_version", 0) + 1
         return error_result
 
 
@@ -329,23 +455,45 @@ def calculate_readiness_score() -> dict[str, Any]:
         - reasons: List of reasons for the decision
         - score_breakdown: Detailed breakdown of scoring components
     """
+    ctx = get_agent_context()
+    if not ctx.get("vision_outputs"):
+        # Scoring without photos can only say "needs more evidence"; tell the agent what to do instead
+        return {
+            "score": 0,
+            "status": "needs_more_evidence",
+            "reasons": ["No vision outputs collected yet - call extract_vision_from_photos_batch first"],
+            "score_breakdown": {},
+        }
+    
     try:
-        from app.scoring import calculate_total_score
-        from app.policy import determine_decision_status, route_action
-        
         scoring_result = calculate_total_score({
-            "vision_outputs": _agent_context.get("vision_outputs", []),
-            "notes": _agent_context.get("notes", ""),
-            "normalized_metadata": _agent_context.get("metadata", {}),
+            "vision_outputs": ctx.get("vision_outputs", []),
+            "notes": ctx.get("notes", ""),
+            "normalized_metadata": ctx.get("metadata", {}),
+            "angle_coverage": get_angle_coverage(),
         })
         
         total_score = scoring_result["total_score"]
-        risk_flags = _agent_context.get("risk_and_consistency", {}).get("flags", [])
+        risk_and_consistency = ctx.get("risk_and_consistency", {})
+        risk_flags = risk_and_consistency.get("flags", [])
         
         # Apply policy rules
         decision = determine_decision_status(total_score, risk_flags, scoring_result)
         next_action = route_action(decision["status"])
         
+        # Kept for the executor, along with what it was computed from so it can tell if it went stale
+        ctx["decision_readiness"] = {
+            "score": total_score,
+            "status": decision["status"],
+            "reasons": decision["reasons"],
+            "breakdown": scoring_result["breakdown"],
+            "next_action": next_action,
+        }
+        ctx["decision_inputs"] = (
+            len(ctx.get("vision_outputs", [])),
+            ctx.get("risk_version", 0),
+        )
+        
         return {
             "score": total_score,
             "status": decision["status"],
@@ -366,6 +514,7 @@ def calculate_readiness_score() -> dict[str, Any]:
 def get_appraisal_tools() -> list:
     """Get list of all appraisal tools for the agent."""
     return [
+        extract_vision_from_photos_batch,
         extract_vision_from_photo,
         check_evidence_completeness,
         retrieve_similar_appraisals,
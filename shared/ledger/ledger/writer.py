@@ -1,10 +1,30 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import atexit
+import functools
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterator
 
 from supabase import Client
 
+logger = logging.getLogger(__name__)
+
+
+async def _run_in_executor(func, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking call on the default executor.
+
+    Unlike asyncio.to_thread this skips copying the caller's contextvars, which
+    none of the ledger calls need.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
 
 def append_ledger_event(
     supabase: Client,
@@ -20,22 +40,224 @@ def append_ledger_event(
     error: str | None = None,
 ) -> None:
     """
-    Append a ledger event (synchronous version).
-    For async usage, wrap in asyncio.to_thread().
+    Queue a ledger event for the background writer and return immediately.
+    See submit_ledger_events.
+    """
+    submit_ledger_events(
+        supabase,
+        [
+            build_ledger_event(
+                appraisal_id=appraisal_id,
+                pipeline_run_id=pipeline_run_id,
+                node_name=node_name,
+                schema_version=schema_version,
+                input_refs=input_refs,
+                output=output,
+                confidence_summary=confidence_summary,
+                status=status,
+                error=error,
+            )
+        ],
+    )
+
+
+def build_ledger_event(
+    *,
+    appraisal_id: str,
+    pipeline_run_id: str,
+    node_name: str,
+    schema_version: str,
+    input_refs: dict[str, Any],
+    output: dict[str, Any] | None,
+    confidence_summary: dict[str, Any] | None,
+    status: str,
+    error: str | None = None,
+) -> dict[str, Any]:
+    """
+    Build a ledger event row for append_ledger_events_batch.
+    The timestamp is taken now rather than defaulted by the database, so events
+    buffered and inserted together keep the order in which they happened.
+    """
+    return {
+        "appraisal_id": appraisal_id,
+        "pipeline_run_id": pipeline_run_id,
+        "node_name": node_name,
+        "schema_version": schema_version,
+        "input_refs": input_refs,
+        "output": output,
+        "confidence_summary": confidence_summary,
+        "status": status,
+        "error": error,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def append_ledger_events_batch(supabase: Client, events: list[dict[str, Any]]) -> None:
+    """
+    Append many ledger events in a single insert (synchronous version).
+    Rows come from build_ledger_event. For async usage, see the *_async variant.
+    """
+    if events:
+        supabase.table("ledger_events").insert(events).execute()
+
+
+async def append_ledger_events_batch_async(supabase: Client, events: list[dict[str, Any]]) -> None:
+    """
+    Append many ledger events in a single insert (async version).
+    Runs the synchronous call on the default executor (contextvars are not propagated).
+    """
+    await _run_in_executor(append_ledger_events_batch, supabase, events)
+
+
+# Bulk insert bounds: each insert carries at most LEDGER_ROWS_PER_INSERT rows and
+# one drain pass writes at most LEDGER_ROWS_PER_INSERT * LEDGER_INSERTS_PER_FLUSH.
+LEDGER_ROWS_PER_INSERT = 100
+LEDGER_INSERTS_PER_FLUSH = 10
+LEDGER_FLUSH_INTERVAL_SECONDS = 0.05
+
+# One queued submission: the client to write with and the rows from build_ledger_event
+LedgerSubmission = tuple[Client, list[dict[str, Any]]]
+
+
+class LedgerBatchWriter:
+    """
+    Coalesces ledger submissions from concurrent pipeline runs into bulk inserts.
+
+    drain_once() takes the next submission off a queue, keeps collecting until
+    LEDGER_ROWS_PER_INSERT * LEDGER_INSERTS_PER_FLUSH rows are pending or
+    LEDGER_FLUSH_INTERVAL_SECONDS has passed, then writes them with write().
+    Submissions are packed whole into inserts of at most LEDGER_ROWS_PER_INSERT
+    rows, so a failed insert is retried per submission without duplicating rows
+    that other inserts already wrote. Failures are logged, never raised.
+    """
+
+    def __init__(
+        self,
+        *,
+        rows_per_insert: int = LEDGER_ROWS_PER_INSERT,
+        inserts_per_flush: int = LEDGER_INSERTS_PER_FLUSH,
+        flush_interval_seconds: float = LEDGER_FLUSH_INTERVAL_SECONDS,
+    ):
+        self._rows_per_insert = rows_per_insert
+        self._max_rows = rows_per_insert * inserts_per_flush
+        self._flush_interval = flush_interval_seconds
+
+    def drain_once(self, source: queue.Queue[LedgerSubmission]) -> None:
+        """Block for the next submission, coalesce what follows, write it and mark it done."""
+        batch = [source.get()]
+        rows = len(batch[0][1])
+        deadline = time.monotonic() + self._flush_interval
+        while rows < self._max_rows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = source.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(item)
+            rows += len(item[1])
+        try:
+            self.write(batch)
+        except Exception:
+            logger.exception("Ledger writer failed to write %d events", rows)
+        finally:
+            for _ in batch:
+                source.task_done()
+
+    def write(self, batch: list[LedgerSubmission]) -> None:
+        """Write submissions with as few inserts as their sizes allow."""
+        groups: list[list[LedgerSubmission]] = []
+        group_rows = 0
+        for item in batch:
+            supabase, events = item
+            if (
+                not groups
+                or groups[-1][0][0] is not supabase
+                or group_rows + len(events) > self._rows_per_insert
+            ):
+                groups.append([])
+                group_rows = 0
+            groups[-1].append(item)
+            group_rows += len(events)
+
+        for group in groups:
+            supabase = group[0][0]
+            rows = [event for _, events in group for event in events]
+            try:
+                self._insert_in_chunks(supabase, rows)
+            except Exception:
+                if len(group) == 1:
+                    _log_write_failure(rows)
+                    continue
+                for _, events in group:
+                    try:
+                        self._insert_in_chunks(supabase, events)
+                    except Exception:
+                        _log_write_failure(events)
+
+    def _insert_in_chunks(self, supabase: Client, rows: list[dict[str, Any]]) -> None:
+        for start in range(0, len(rows), self._rows_per_insert):
+            append_ledger_events_batch(supabase, rows[start:start + self._rows_per_insert])
+
+
+def _log_write_failure(rows: list[dict[str, Any]]) -> None:
+    # Called from an except block; names the affected runs so lost rows can be traced
+    run_ids = sorted({str(row.get("pipeline_run_id")) for row in rows})
+    logger.exception("Failed to write %d ledger events for pipeline runs %s", len(rows), ", ".join(run_ids))
+
+
+_ledger_queue: queue.Queue[LedgerSubmission] = queue.Queue()
+_ledger_batch_writer = LedgerBatchWriter()
+_ledger_thread: threading.Thread | None = None
+_ledger_thread_lock = threading.Lock()
+
+
+def submit_ledger_events(supabase: Client, events: list[dict[str, Any]]) -> None:
+    """
+    Queue rows from build_ledger_event for a background insert and return immediately.
+
+    A dedicated writer thread feeds the queue to a LedgerBatchWriter, so Supabase
+    latency stays off the pipeline's critical path. Write failures are logged,
+    not raised; call flush_ledger() to wait for pending rows.
+    """
+    if not events:
+        return
+    _ensure_ledger_thread()
+    _ledger_queue.put((supabase, events))
+
+
+def flush_ledger(timeout: float | None = None) -> bool:
+    """
+    Block until every queued ledger row has been written (or given up on).
+    Returns False, and logs a warning, if the timeout expired first.
     """
-    supabase.table("ledger_events").insert(
-        {
-            "appraisal_id": appraisal_id,
-            "pipeline_run_id": pipeline_run_id,
-            "node_name": node_name,
-            "schema_version": schema_version,
-            "input_refs": input_refs,
-            "output": output,
-            "confidence_summary": confidence_summary,
-            "status": status,
-            "error": error,
-        }
-    ).execute()
+    with _ledger_queue.all_tasks_done:
+        flushed = _ledger_queue.all_tasks_done.wait_for(
+            lambda: not _ledger_queue.unfinished_tasks, timeout
+        )
+    if not flushed:
+        logger.warning("Ledger flush timed out after %ss with %d submissions pending", timeout, _ledger_queue.unfinished_tasks)
+    return flushed
+
+
+def _ensure_ledger_thread() -> None:
+    global _ledger_thread
+    if _ledger_thread is not None and _ledger_thread.is_alive():
+        return
+    with _ledger_thread_lock:
+        if _ledger_thread is None or not _ledger_thread.is_alive():
+            _ledger_thread = threading.Thread(target=_drain_ledger_queue, name="ledger-writer", daemon=True)
+            _ledger_thread.start()
+
+
+def _drain_ledger_queue() -> None:
+    while True:
+        _ledger_batch_writer.drain_once(_ledger_queue)
+
+
+# Give queued events a chance to land on normal interpreter exit
+atexit.register(flush_ledger, 5.0)
 
 
 async def append_ledger_event_async(
@@ -53,10 +275,9 @@ async def append_ledger_event_async(
 ) -> None:
     """
     Append a ledger event (async version).
-    Wraps synchronous call in asyncio.to_thread().
+    Queues the event for the background writer; does not wait for the insert.
     """
-    await asyncio.to_thread(
-        append_ledger_event,
+    append_ledger_event(
         supabase,
         appraisal_id=appraisal_id,
         pipeline_run_id=pipeline_run_id,
@@ -70,26 +291,62 @@ async def append_ledger_event_async(
     )
 
 
+LEDGER_FETCH_PAGE_SIZE = 500
+
+
 def fetch_ledger_events(
     supabase: Client,
     *,
     appraisal_id: str,
     pipeline_run_id: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
 ) -> list[dict[str, Any]]:
     """
     Fetch ledger events (synchronous version).
-    For async usage, wrap in asyncio.to_thread().
+    With limit set, only rows offset..offset+limit-1 are requested (server-side range).
+    For async usage, see the *_async variant.
     """
     query = (
         supabase.table("ledger_events")
         .select("*")
         .eq("appraisal_id", appraisal_id)
         .order("timestamp", desc=False)
+        .order("id", desc=False)  # tie-break so pages are stable
     )
     if pipeline_run_id:
         query = query.eq("pipeline_run_id", pipeline_run_id)
+    if limit is not None:
+        query = query.range(offset, offset + limit - 1)
     result = query.execute()
-    return list(result.data or [])
+    return result.data if result.data else []
+
+
+def iter_ledger_events(
+    supabase: Client,
+    *,
+    appraisal_id: str,
+    pipeline_run_id: str | None = None,
+    page_size: int = LEDGER_FETCH_PAGE_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yield ledger events page by page (page_size rows per request) so callers
+    never hold more than one page and can stop early.
+    """
+    offset = 0
+    while True:
+        page = fetch_ledger_events(
+            supabase,
+            appraisal_id=appraisal_id,
+            pipeline_run_id=pipeline_run_id,
+            limit=page_size,
+            offset=offset,
+        )
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        offset += page_size
 
 
 async def fetch_ledger_events_async(
@@ -97,14 +354,18 @@ async def fetch_ledger_events_async(
     *,
     appraisal_id: str,
     pipeline_run_id: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
 ) -> list[dict[str, Any]]:
     """
     Fetch ledger events (async version).
-    Wraps synchronous call in asyncio.to_thread().
+    Runs the synchronous call on the default executor (contextvars are not propagated).
     """
-    return await asyncio.to_thread(
+    return await _run_in_executor(
         fetch_ledger_events,
         supabase,
         appraisal_id=appraisal_id,
         pipeline_run_id=pipeline_run_id,
+        limit=limit,
+        offset=offset,
     )
@@ -1 +1,23 @@
-"""RAG package for retrieval-augmented generation with graceful fallback."""
+"""
+RAG package for retrieval-augmented generation with graceful fallback.
+
+Puts the backend (for ``app.settings`` / ``app.supabase_client``) on sys.path
+once, unless it is already loaded, before any submodule imports it.
+"""
+
+import sys
+from pathlib import Path
+
+if "app" not in sys.modules:
+    _current_file = Path(__file__).resolve()
+    _backend_path = Path("/app")
+    if not (_backend_path / "app").exists():
+        # Try to find backend in parent directories
+        for _parent in _current_file.parents:
+            _candidate = _parent / "backend"
+            if _candidate.exists():
+                _backend_path = _candidate
+                break
+
+    if str(_backend_path) not in sys.path:
+        sys.path.insert(0, str(_backend_path))
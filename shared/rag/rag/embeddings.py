@@ -2,25 +2,20 @@
 
 from __future__ import annotations
 
-import sys
-from pathlib import Path
-
-# Add backend to path for imports
-current_file = Path(__file__).resolve()
-backend_path = Path("/app")
-if not (backend_path / "app").exists():
-    # Try to find backend in parent directories
-    for parent in current_file.parents:
-        candidate = parent / "backend"
-        if candidate.exists():
-            backend_path = candidate
-            break
-
-if str(backend_path) not in sys.path:
-    sys.path.insert(0, str(backend_path))
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
 
 from openai import OpenAI
 
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 try:
     from app.settings import get_settings
 except ImportError:
@@ -29,10 +24,179 @@ except ImportError:
         raise ImportError("Settings not available")
 
 
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_DIM = 1536
+EMBEDDING_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+
+class _RedisEmbeddingCache:
+    """
+    Cross-process embedding cache in Redis.
+
+    Vectors are stored as packed float64 arrays under a key namespaced by model
+    and dimension. Any Redis failure is swallowed so callers fall through to the
+    API.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int = EMBEDDING_CACHE_TTL_SECONDS):
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._ttl = ttl_seconds
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        digest = hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+        return f"emb:{model}:{EMBEDDING_DIM}:{digest}"
+
+    def get(self, model: str, text: str) -> tuple[float, ...] | None:
+        try:
+            raw = self._client.get(self.key(model, text))
+        except Exception:
+            return None
+        if not raw:
+            return None
+        return tuple(array("d", raw))
+
+    def set(self, model: str, text: str, embedding: tuple[float, ...]) -> None:
+        try:
+            self._client.setex(self.key(model, text), self._ttl, array("d", embedding).tobytes())
+        except Exception:
+            pass
+
+
+@lru_cache(maxsize=1)
+def _get_l2_cache() -> _RedisEmbeddingCache | None:
+    """Return the Redis embedding cache if ENABLE_EMBEDDING_CACHE is set, else None."""
+    if not REDIS_AVAILABLE:
+        return None
+    try:
+        settings = get_settings()
+        if not settings.enable_embedding_cache:
+            return None
+        return _RedisEmbeddingCache(settings.redis_url)
+    except Exception:
+        return None
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _EmbeddingLRU:
+    """
+    Thread-safe in-process LRU of embeddings keyed on (model, cache key).
+
+    Used instead of functools.lru_cache so the batch path can check and seed
+    entries per text. Values are tuples so cached vectors cannot be mutated by
+    callers.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: OrderedDict[tuple[str, str], tuple[float, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple[str, str]) -> tuple[float, ...] | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: tuple[str, str], value: tuple[float, ...]) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_l1_cache = _EmbeddingLRU(maxsize=10000)
+
+# OpenAI accepts at most 2048 inputs per embeddings request
+_MAX_INPUTS_PER_REQUEST = 2048
+
+
+_TRAILING_PUNCTUATION = ".,;:!?"
+
+
+def _cache_key(text: str) -> str:
+    """
+    Near-duplicate key for stripped text: casefolded, whitespace collapsed and
+    trailing punctuation dropped.
+
+    Trivial variants ("2019 Honda Civic" vs "2019 honda  civic.") embed to
+    near-identical vectors, so they share one cache entry and one API call.
+    Punctuation-only text keeps its punctuation so it does not collapse to ''.
+    """
+    collapsed = " ".join(text.casefold().split())
+    return collapsed.rstrip(_TRAILING_PUNCTUATION) or collapsed
+
+
+def _get_cached_embedding(model: str, cache_key: str) -> tuple[float, ...] | None:
+    """Look up an embedding in L1, then L2 (promoting L2 hits into L1)."""
+    key = (model, cache_key)
+    embedding = _l1_cache.get(key)
+    if embedding is not None:
+        return embedding
+    l2_cache = _get_l2_cache()
+    if l2_cache is not None:
+        embedding = l2_cache.get(model, cache_key)
+        if embedding is not None:
+            _l1_cache.put(key, embedding)
+    return embedding
+
+
+def _store_embedding(model: str, cache_key: str, embedding: tuple[float, ...]) -> None:
+    """Populate both cache tiers."""
+    _l1_cache.put((model, cache_key), embedding)
+    l2_cache = _get_l2_cache()
+    if l2_cache is not None:
+        l2_cache.set(model, cache_key, embedding)
+
+
+@lru_cache(maxsize=1)
+def _openai_client() -> OpenAI:
+    """Shared OpenAI client so embedding calls reuse its HTTP connection pool."""
+    return OpenAI(api_key=get_settings().openai_api_key)
+
+
+def _generate_embeddings_uncached(model: str, texts: list[str]) -> list[tuple[float, ...]]:
+    """Call the OpenAI embeddings API for already-stripped texts, in input order."""
+    client = _openai_client()
+
+    embeddings: list[tuple[float, ...]] = []
+    for start in range(0, len(texts), _MAX_INPUTS_PER_REQUEST):
+        response = client.embeddings.create(
+            model=model,
+            input=texts[start:start + _MAX_INPUTS_PER_REQUEST]
+        )
+        ordered = sorted(response.data, key=lambda item: item.index)
+        embeddings.extend(tuple(item.embedding) for item in ordered)
+    return embeddings
+
+
 def generate_embedding(text: str) -> list[float]:
     """
     Generate embedding using OpenAI text-embedding-ada-002.
     
+    Results are cached in-process (keyed so that case, whitespace and trailing
+    punctuation variants share an entry); see generate_embedding.cache_info()
+    for hit/miss counts.
+    
     Args:
         text: Text to generate embedding for
         
@@ -45,23 +209,86 @@ def generate_embedding(text: str) -> list[float]:
     if not text or not text.strip():
         raise ValueError("Text cannot be empty")
     
+    text = text.strip()
+    cache_key = _cache_key(text)
     try:
-        settings = get_settings()
-        client = OpenAI(api_key=settings.openai_api_key)
-        
-        response = client.embeddings.create(
-            model="text-embedding-ada-002",
-            input=text.strip()
-        )
-        return response.data[0].embedding
+        embedding = _get_cached_embedding(EMBEDDING_MODEL, cache_key)
+        if embedding is None:
+            embedding = _generate_embeddings_uncached(EMBEDDING_MODEL, [text])[0]
+            _store_embedding(EMBEDDING_MODEL, cache_key, embedding)
+        return list(embedding)
     except Exception as e:
         raise RuntimeError(f"Failed to generate embedding: {str(e)}") from e
 
 
+generate_embedding.cache_info = _l1_cache.cache_info
+generate_embedding.cache_clear = _l1_cache.cache_clear
+
+
+def generate_embeddings_batch(texts: list[str]) -> list[list[float]]:
+    """
+    Generate embeddings for several texts with a single OpenAI request.
+    
+    Texts are stripped and deduplicated (near-duplicates included, see
+    _cache_key); cached texts are served from the L1/L2 caches and only the
+    remaining unique texts are sent to the API.
+    
+    Args:
+        texts: Texts to generate embeddings for
+        
+    Returns:
+        List of embedding vectors in the same order as texts
+        
+    Raises:
+        ValueError: If any text is empty
+        RuntimeError: If embedding generation fails
+    """
+    stripped = [text.strip() if text else "" for text in texts]
+    if not all(stripped):
+        raise ValueError("Text cannot be empty")
+    
+    try:
+        keys = [_cache_key(text) for text in stripped]
+        embedding_by_key: dict[str, tuple[float, ...]] = {}
+        # cache key -> first text seen for it, which is what gets embedded
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, stripped):
+            if key in embedding_by_key or key in missing:
+                continue
+            embedding = _get_cached_embedding(EMBEDDING_MODEL, key)
+            if embedding is None:
+                missing[key] = text
+            else:
+                embedding_by_key[key] = embedding
+        
+        if missing:
+            generated = _generate_embeddings_uncached(EMBEDDING_MODEL, list(missing.values()))
+            for key, embedding in zip(missing, generated):
+                _store_embedding(EMBEDDING_MODEL, key, embedding)
+                embedding_by_key[key] = embedding
+        
+        return [list(embedding_by_key[key]) for key in keys]
+    except Exception as e:
+        raise RuntimeError(f"Failed to generate embeddings: {str(e)}") from e
+
+
 async def generate_embedding_async(text: str) -> list[float]:
     """
     Async version of generate_embedding.
-    Wraps synchronous call in asyncio.to_thread().
+    Runs the synchronous call on the default executor directly rather than via
+    asyncio.to_thread, so contextvars are not propagated.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, generate_embedding, text)
+
+
+async def generate_embeddings_batch_async(texts: list[str]) -> list[list[float]]:
+    """
+    Async version of generate_embeddings_batch.
+    Runs the synchronous call on the default executor directly rather than via
+    asyncio.to_thread, so contextvars are not propagated.
     """
     import asyncio
-    return await asyncio.to_thread(generate_embedding, text)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, generate_embeddings_batch, texts)
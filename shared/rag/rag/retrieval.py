@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 from typing import Any
 
-from .embeddings import generate_embedding
+from .embeddings import (
+    generate_embedding,
+    generate_embedding_async,
+    generate_embeddings_batch,
+    generate_embeddings_batch_async,
+)
 from .vector_store import search_similar
 
 
@@ -69,6 +76,176 @@ def retrieve_similar_appraisals(
         }
 
 
+def retrieve_similar_appraisals_batch(
+    query_texts: list[str],
+    limit: int = 5,
+    match_threshold: float = 0.7,
+    content_types: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Retrieve similar appraisals for several query texts at once.
+    
+    All query embeddings are generated with a single OpenAI request (see
+    generate_embeddings_batch). Duplicate query texts are embedded and searched
+    once and share the result.
+    
+    Args:
+        query_texts: Texts to search for
+        limit: Maximum number of results per query
+        match_threshold: Minimum similarity score (0.0 to 1.0)
+        content_types: Optional list of content types to search
+        
+    Returns:
+        One result dictionary per query text, in the same shape as
+        retrieve_similar_appraisals.
+    """
+    stripped = [text.strip() if text else "" for text in query_texts]
+    # Identical query texts share one embedding and one vector search
+    unique_texts = [text for text in dict.fromkeys(stripped) if text]
+    result_by_text: dict[str, dict[str, Any]] = {
+        "": {
+            "similar_appraisals": [],
+            "rag_enabled": False,
+            "rag_error": "Empty query text"
+        }
+    }
+    
+    if unique_texts:
+        try:
+            embeddings = generate_embeddings_batch(unique_texts)
+        except Exception as e:
+            failed = {
+                "similar_appraisals": [],
+                "rag_enabled": False,
+                "rag_error": str(e)
+            }
+            result_by_text.update(dict.fromkeys(unique_texts, failed))
+        else:
+            for text, query_embedding in zip(unique_texts, embeddings):
+                # search_similar degrades to [] on its own failures
+                similar = search_similar(
+                    supabase=None,
+                    query_embedding=query_embedding,
+                    limit=limit,
+                    match_threshold=match_threshold,
+                    content_types=content_types,
+                )
+                result_by_text[text] = {
+                    "similar_appraisals": similar,
+                    "rag_enabled": True,
+                    "rag_error": None
+                }
+    
+    return [dict(result_by_text[text]) for text in stripped]
+
+
+async def _search_similar_async(**kwargs: Any) -> list[dict[str, Any]]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(search_similar, supabase=None, **kwargs))
+
+
+async def retrieve_similar_appraisals_async(
+    query_text: str,
+    limit: int = 5,
+    match_threshold: float = 0.7,
+    content_types: list[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Async version of retrieve_similar_appraisals.
+    
+    Embedding and search run on the default executor, so several retrievals
+    awaited together with asyncio.gather overlap their network I/O.
+    """
+    if not query_text or not query_text.strip():
+        return {
+            "similar_appraisals": [],
+            "rag_enabled": False,
+            "rag_error": "Empty query text"
+        }
+    
+    try:
+        query_embedding = await generate_embedding_async(query_text.strip())
+        similar = await _search_similar_async(
+            query_embedding=query_embedding,
+            limit=limit,
+            match_threshold=match_threshold,
+            content_types=content_types,
+        )
+        return {
+            "similar_appraisals": similar,
+            "rag_enabled": True,
+            "rag_error": None
+        }
+    except Exception as e:
+        return {
+            "similar_appraisals": [],
+            "rag_enabled": False,
+            "rag_error": str(e)
+        }
+
+
+async def retrieve_similar_appraisals_batch_async(
+    query_texts: list[str],
+    limit: int = 5,
+    match_threshold: float = 0.7,
+    content_types: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Async version of retrieve_similar_appraisals_batch.
+    
+    Unique query texts are embedded in one request, then their vector searches
+    run concurrently via asyncio.gather.
+    """
+    stripped = [text.strip() if text else "" for text in query_texts]
+    unique_texts = [text for text in dict.fromkeys(stripped) if text]
+    result_by_text: dict[str, dict[str, Any]] = {
+        "": {
+            "similar_appraisals": [],
+            "rag_enabled": False,
+            "rag_error": "Empty query text"
+        }
+    }
+    
+    if unique_texts:
+        try:
+            embeddings = await generate_embeddings_batch_async(unique_texts)
+        except Exception as e:
+            failed = {
+                "similar_appraisals": [],
+                "rag_enabled": False,
+                "rag_error": str(e)
+            }
+            result_by_text.update(dict.fromkeys(unique_texts, failed))
+        else:
+            # search_similar degrades to [] on its own failures
+            searches = await asyncio.gather(*[
+                _search_similar_async(
+                    query_embedding=query_embedding,
+                    limit=limit,
+                    match_threshold=match_threshold,
+                    content_types=content_types,
+                )
+                for query_embedding in embeddings
+            ])
+            for text, similar in zip(unique_texts, searches):
+                result_by_text[text] = {
+                    "similar_appraisals": similar,
+                    "rag_enabled": True,
+                    "rag_error": None
+                }
+    
+    return [dict(result_by_text[text]) for text in stripped]
+
+
+# (metadata key, label, keep falsy values such as a mileage of 0)
+_METADATA_FIELDS = (
+    ("year", "Year", False),
+    ("make", "Make", False),
+    ("model", "Model", False),
+    ("mileage", "Mileage", True),
+)
+
+
 def build_query_text_from_context(context: dict[str, Any]) -> str:
     """
     Build query text from pipeline context for RAG retrieval.
@@ -79,22 +256,16 @@ def build_query_text_from_context(context: dict[str, Any]) -> str:
     Returns:
         Query text string for embedding generation
     """
-    parts = []
-    
     # Extract normalized metadata
     normalized = context.get("ingest_normalize", {})
     metadata = normalized.get("normalized_metadata", {})
     
-    if metadata:
-        # Add vehicle information
-        if metadata.get("year"):
-            parts.append(f"Year: {metadata['year']}")
-        if metadata.get("make"):
-            parts.append(f"Make: {metadata['make']}")
-        if metadata.get("model"):
-            parts.append(f"Model: {metadata['model']}")
-        if metadata.get("mileage") is not None:
-            parts.append(f"Mileage: {metadata['mileage']}")
+    # Add vehicle information
+    parts = [
+        f"{label}: {metadata[key]}"
+        for key, label, keep_falsy in _METADATA_FIELDS
+        if (metadata.get(key) is not None if keep_falsy else metadata.get(key))
+    ]
     
     # Add notes
     notes = normalized.get("notes", "")
@@ -103,15 +274,13 @@ def build_query_text_from_context(context: dict[str, Any]) -> str:
     
     # Add vision summary if available
     vision_outputs = context.get("vision_per_image", {}).get("vision_outputs", [])
-    if vision_outputs:
-        damage_items = []
-        for output in vision_outputs:
-            extraction = output.get("extraction", {})
-            damage = extraction.get("damage", [])
-            for d in damage:
-                if d.get("type"):
-                    damage_items.append(d["type"])
-        if damage_items:
-            parts.append(f"Damage: {', '.join(damage_items)}")
+    damage_items = [
+        d["type"]
+        for output in vision_outputs
+        for d in output.get("extraction", {}).get("damage", [])
+        if d.get("type")
+    ]
+    if damage_items:
+        parts.append(f"Damage: {', '.join(damage_items)}")
     
     return " | ".join(parts) if parts else ""
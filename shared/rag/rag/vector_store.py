@@ -2,25 +2,11 @@
 
 from __future__ import annotations
 
-import sys
-from pathlib import Path
+from array import array
 from typing import Any
 
-# Add backend to path for imports
-current_file = Path(__file__).resolve()
-backend_path = Path("/app")
-if not (backend_path / "app").exists():
-    # Try to find backend in parent directories
-    for parent in current_file.parents:
-        candidate = parent / "backend"
-        if candidate.exists():
-            backend_path = candidate
-            break
-
-if str(backend_path) not in sys.path:
-    sys.path.insert(0, str(backend_path))
-
 try:
+    from postgrest.types import ReturnMethod
     from supabase import Client
     from app.supabase_client import get_supabase_client
 except ImportError:
@@ -30,6 +16,32 @@ except ImportError:
         raise ImportError("Supabase client not available")
 
 
+# Dimension of appraisal_embeddings.embedding (vector(1536) in 002_rag_embeddings.sql)
+EXPECTED_DIM = 1536
+
+
+# Whether match_appraisals_with_outcomes exists: None until the first search
+# finds out, then reused so later searches skip the failed probe round-trip.
+# Only set to False on PostgREST's definite missing-function error (PGRST202).
+_enriched_rpc_available: bool | None = None
+
+
+def _set_enriched_rpc_available(available: bool) -> None:
+    global _enriched_rpc_available
+    _enriched_rpc_available = available
+
+
+def to_vector_literal(embedding: list[float]) -> str:
+    """
+    Format an embedding as a pgvector text literal ("[0.1,0.2,...]").
+    
+    pgvector stores float32, so values are rounded to float32 first and written
+    with 9 significant digits, which round-trips exactly; this is roughly 40%
+    smaller on the wire than JSON-encoding Python floats.
+    """
+    return "[" + ",".join([format(value, ".9g") for value in array("f", embedding)]) + "]"
+
+
 def store_embedding(
     supabase: Client | None,
     appraisal_id: str,
@@ -37,10 +49,13 @@ def store_embedding(
     content_text: str,
     embedding: list[float],
     pipeline_run_id: str | None = None,
-) -> dict[str, Any]:
+) -> None:
     """
     Store embedding in Supabase appraisal_embeddings table.
     
+    The insert uses return=minimal, so PostgREST does not echo the stored row
+    (with its full vector) back in the response.
+    
     Args:
         supabase: Supabase client (if None, gets from settings)
         appraisal_id: UUID of the appraisal
@@ -49,28 +64,27 @@ def store_embedding(
         embedding: The embedding vector (1536 dimensions)
         pipeline_run_id: Optional pipeline run ID
         
-    Returns:
-        Dictionary with stored embedding record
-        
     Raises:
+        ValueError: If the embedding is not EXPECTED_DIM long
         RuntimeError: If storage fails
     """
+    if len(embedding) != EXPECTED_DIM:
+        raise ValueError(f"Embedding must have {EXPECTED_DIM} dimensions, got {len(embedding)}")
     if supabase is None:
         supabase = get_supabase_client()
     
     try:
-        result = (
+        (
             supabase.table("appraisal_embeddings")
             .insert({
                 "appraisal_id": appraisal_id,
                 "pipeline_run_id": pipeline_run_id,
                 "content_type": content_type,
                 "content_text": content_text,
-                "embedding": embedding,
-            })
+                "embedding": to_vector_literal(embedding),
+            }, returning=ReturnMethod.minimal)
             .execute()
         )
-        return result.data[0] if result.data else {}
     except Exception as e:
         raise RuntimeError(f"Failed to store embedding: {str(e)}") from e
 
@@ -98,6 +112,10 @@ def search_similar(
         List of similar appraisal embeddings with similarity scores.
         Returns empty list on failure (graceful degradation).
     """
+    # The RPC would reject a wrongly sized vector anyway; skip the round-trip
+    if len(query_embedding) != EXPECTED_DIM:
+        return []
+    
     if supabase is None:
         try:
             supabase = get_supabase_client()
@@ -105,54 +123,57 @@ def search_similar(
             # Graceful fallback: return empty list if client unavailable
             return []
     
+    query_vector = to_vector_literal(query_embedding)
+    
     try:
-        # Try enriched function first if outcomes requested
-        if include_outcomes:
+        # Try enriched function first if outcomes requested, unless an earlier
+        # call found it missing on this deployment
+        if include_outcomes and _enriched_rpc_available is not False:
             try:
                 result = supabase.rpc(
                     "match_appraisals_with_outcomes",
                     {
-                        "query_embedding": query_embedding,
+                        "query_embedding": query_vector,
                         "match_threshold": match_threshold,
                         "match_count": limit,
                         "content_types": content_types or [],
                     }
                 ).execute()
+                _set_enriched_rpc_available(True)
                 
                 # Transform results to match expected format
-                if result.data:
-                    transformed = []
-                    for item in result.data:
-                        transformed.append({
-                            "id": None,
-                            "appraisal_id": item.get("appraisal_id"),
-                            "content_type": item.get("content_type"),
-                            "content_text": item.get("content_text"),
-                            "similarity": item.get("similarity"),
-                            "metadata_json": item.get("metadata_json"),
-                            "historical_outcome": item.get("latest_run_outputs"),
-                        })
-                    return transformed
+                return [
+                    {
+                        "id": None,
+                        "appraisal_id": item.get("appraisal_id"),
+                        "content_type": item.get("content_type"),
+                        "content_text": item.get("content_text"),
+                        "similarity": item.get("similarity"),
+                        "metadata_json": item.get("metadata_json"),
+                        "historical_outcome": item.get("latest_run_outputs"),
+                    }
+                    for item in result.data or []
+                ]
             except Exception as e:
                 # If enriched function doesn't exist, fall back to basic function
                 error_str = str(e).lower()
-                if any(indicator in error_str for indicator in [
-                    "pgrst202", 
-                    "could not find the function",
+                if getattr(e, "code", None) == "PGRST202" or "could not find the function" in error_str:
+                    # PostgREST's definite "no such function": remember it for later searches
+                    _set_enriched_rpc_available(False)
+                elif not any(indicator in error_str for indicator in [
                     "404",
                     "not found",
                     "function does not exist"
                 ]):
-                    pass  # Fall through to basic function
-                else:
                     # Other errors: graceful fallback
                     return []
+                # Looser matches (e.g. a gateway 404) fall back for this call only
         
         # Use basic function (fallback or when outcomes not requested)
         result = supabase.rpc(
             "match_appraisal_embeddings",
             {
-                "query_embedding": query_embedding,
+                "query_embedding": query_vector,
                 "match_threshold": match_threshold,
                 "match_count": limit,
                 "content_types": content_types or [],